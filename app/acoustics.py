@@ -0,0 +1,65 @@
+# app/acoustics.py
+
+import numpy as np
+
+from app.vad import frame_energy_db, mask_runs, speech_mask
+
+FRAME_MS = 30
+HOP_MS = 10
+MIN_PAUSE_MS = 250   # shorter gaps are articulation, not pauses
+LONG_PAUSE_MS = 2000
+
+
+def acoustic_metrics(samples, sample_rate=16000):
+    """
+    Speaking time and pause statistics computed directly from the waveform
+    (vectorized framing + energy VAD, well under real time on CPU)
+    Args:
+        samples (np.ndarray): Mono float32 signal
+        sample_rate (int): Sample rate of `samples`
+    Returns:
+        dict: total_duration, speaking_time, speech_ratio, pause_count, pause_mean,
+              pause_median, pause_p90, pause_max, long_pause_count (seconds / counts)
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    total = len(samples) / float(sample_rate)
+    metrics = {
+        "total_duration": round(total, 2),
+        "speaking_time": 0.0,
+        "speech_ratio": 0.0,
+        "pause_count": 0,
+        "pause_mean": 0.0,
+        "pause_median": 0.0,
+        "pause_p90": 0.0,
+        "pause_max": 0.0,
+        "long_pause_count": 0,
+    }
+    if total == 0:
+        return metrics
+
+    mask = speech_mask(frame_energy_db(samples, sample_rate, FRAME_MS, HOP_MS))
+    speech_runs = mask_runs(mask)
+    if len(speech_runs) == 0:
+        return metrics
+
+    hop_s = HOP_MS / 1000.0
+    speaking_time = float(mask.sum()) * hop_s
+
+    # Pauses are the silent gaps between speech runs (leading/trailing silence excluded)
+    gaps = (speech_runs[1:, 0] - speech_runs[:-1, 1]) * hop_s
+    pauses = gaps[gaps >= MIN_PAUSE_MS / 1000.0]
+
+    metrics.update(
+        speaking_time=round(speaking_time, 2),
+        speech_ratio=round(speaking_time / total, 3),
+        pause_count=int(len(pauses)),
+        long_pause_count=int((pauses >= LONG_PAUSE_MS / 1000.0).sum()),
+    )
+    if len(pauses):
+        metrics.update(
+            pause_mean=round(float(pauses.mean()), 2),
+            pause_median=round(float(np.median(pauses)), 2),
+            pause_p90=round(float(np.percentile(pauses, 90)), 2),
+            pause_max=round(float(pauses.max()), 2),
+        )
+    return metrics
@@ -0,0 +1,145 @@
+# app/audio_decode.py
+
+import os
+import shutil
+import struct
+import subprocess
+
+import numpy as np
+
+TARGET_RATE = 16000  # what Whisper and the acoustic metrics expect
+
+_PCM_DTYPES = {1: np.uint8, 2: np.dtype("<i2"), 4: np.dtype("<i4")}
+
+
+# -----------------------------
+# Input handling
+# -----------------------------
+def _as_memoryview(source):
+    """Path, bytes, memoryview or file-like -> memoryview (no copy for in-memory inputs)"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return memoryview(f.read())
+    if isinstance(source, memoryview):
+        return source.cast("B") if source.format != "B" else source
+    if isinstance(source, (bytes, bytearray)):
+        return memoryview(source)
+    if hasattr(source, "getbuffer"):  # BytesIO / Streamlit UploadedFile
+        return source.getbuffer()
+    return memoryview(source.read())
+
+
+def _parse_wav_header(buf):
+    """
+    Locate the fmt and data chunks of a RIFF/WAVE buffer.
+    Returns (channels, sample_rate, sample_width, data_offset, data_size) or None if not PCM WAV.
+    """
+    if len(buf) < 12 or bytes(buf[0:4]) != b"RIFF" or bytes(buf[8:12]) != b"WAVE":
+        return None
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(buf):
+        chunk_id = bytes(buf[pos:pos + 4])
+        (size,) = struct.unpack_from("<I", buf, pos + 4)
+        body = pos + 8
+        if chunk_id == b"fmt ":
+            audio_format, channels, rate, _, _, bits = struct.unpack_from("<HHIIHH", buf, body)
+            if audio_format == 0xFFFE and size >= 40:  # WAVE_FORMAT_EXTENSIBLE: real format in the GUID
+                (audio_format,) = struct.unpack_from("<H", buf, body + 24)
+            if audio_format != 1 or bits // 8 not in _PCM_DTYPES:
+                return None
+            fmt = (channels, rate, bits // 8)
+        elif chunk_id == b"data" and fmt is not None:
+            size = min(size, len(buf) - body)  # tolerate truncated/streamed files
+            return fmt + (body, size)
+        pos = body + size + (size & 1)  # chunks are word aligned
+    return None
+
+
+# -----------------------------
+# Signal conversion
+# -----------------------------
+def _to_float32(pcm, sample_width, channels):
+    """Integer PCM view -> mono float32 in [-1, 1], using one output buffer"""
+    if channels > 1:
+        frames = len(pcm) // channels
+        pcm = pcm[:frames * channels].reshape(frames, channels)
+        out = pcm.mean(axis=1, dtype=np.float32)
+    else:
+        out = pcm.astype(np.float32)
+    if sample_width == 1:
+        out -= 128.0
+        out *= 1 / 128.0
+    else:
+        out *= 1 / float(2 ** (8 * sample_width - 1))
+    return out
+
+
+def resample(samples, source_rate, target_rate=TARGET_RATE):
+    """Vectorized resampling (polyphase FIR when scipy is available, linear otherwise)"""
+    if source_rate == target_rate or len(samples) == 0:
+        return samples
+    try:
+        from math import gcd
+        from scipy.signal import resample_poly
+
+        g = gcd(int(source_rate), int(target_rate))
+        return resample_poly(samples, target_rate // g, source_rate // g).astype(np.float32, copy=False)
+    except ImportError:
+        n_out = int(round(len(samples) * target_rate / source_rate))
+        positions = np.arange(n_out, dtype=np.float64) * (source_rate / target_rate)
+        return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def _decode_with_ffmpeg(buf, target_rate):
+    """Fallback for non-WAV inputs (mp3/m4a/...): ffmpeg pipes 16 kHz mono s16le back over stdout"""
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError(
+            "Unsupported audio format: only PCM WAV can be decoded without ffmpeg "
+            "(install ffmpeg or upload a .wav file)"
+        )
+    proc = subprocess.run(
+        ["ffmpeg", "-nostdin", "-loglevel", "error", "-i", "pipe:0",
+         "-f", "s16le", "-ac", "1", "-ar", str(target_rate), "pipe:1"],
+        input=buf, capture_output=True, check=True,
+    )
+    pcm = np.frombuffer(proc.stdout, dtype="<i2")
+    return _to_float32(pcm, 2, 1)
+
+
+# -----------------------------
+# Public API
+# -----------------------------
+def probe_duration(source):
+    """Audio duration in seconds from the WAV header alone (no sample decoding)"""
+    buf = _as_memoryview(source)
+    header = _parse_wav_header(buf)
+    if header is None:
+        return decode_audio(buf)["duration"]
+    channels, rate, width, _, size = header
+    return size // (channels * width) / float(rate)
+
+
+def decode_audio(source, target_rate=TARGET_RATE):
+    """
+    Decode an upload once into mono float32 at `target_rate`
+    Args:
+        source: File path, bytes, memoryview or file-like object
+        target_rate (int): Output sample rate
+    Returns:
+        dict: samples (np.float32 array), sample_rate, duration (seconds), source_rate
+    """
+    buf = _as_memoryview(source)
+    header = _parse_wav_header(buf)
+    if header is None:
+        samples = _decode_with_ffmpeg(buf, target_rate)
+        return {"samples": samples, "sample_rate": target_rate,
+                "duration": len(samples) / float(target_rate), "source_rate": None}
+
+    channels, rate, width, offset, size = header
+    usable = size - size % (channels * width)
+    # np.frombuffer over the memoryview: the PCM bytes are never copied
+    pcm = np.frombuffer(buf, dtype=_PCM_DTYPES[width], count=usable // width, offset=offset)
+    samples = resample(_to_float32(pcm, width, channels), rate, target_rate)
+    return {"samples": samples, "sample_rate": target_rate,
+            "duration": usable // (channels * width) / float(rate), "source_rate": rate}
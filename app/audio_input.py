@@ -1,46 +1,35 @@
 # app/audio_input.py
 
-import speech_recognition as sr
-import wave
-import contextlib
-import os
+from app import config
+from app.audio_decode import decode_audio
+from app.transcription import transcribe_stream
 
-def transcribe_audio(file_path):
-    """Transcribe audio file and return text + metadata"""
+def transcribe_audio(source, backend=None, keep_audio=False):
+    """
+    Transcribe audio (file path, or uploaded bytes decoded in memory) and return text + metadata.
+    The upload is decoded once; with keep_audio=True the decoded 16 kHz signal is
+    returned under "audio" so pace/acoustic metrics can reuse it.
+    """
     result = {
         "text": "",
         "duration": 0,
+        "segments": [],
         "error": None
     }
     
     try:
-        # Get audio duration
-        with contextlib.closing(wave.open(file_path, 'r')) as f:
-            frames = f.getnframes()
-            rate = f.getframerate()
-            result["duration"] = frames / float(rate)
-            
-        # Initialize recognizer
-        r = sr.Recognizer()
-        
-        # Process audio file
-        with sr.AudioFile(file_path) as source:
-            audio = r.record(source)  # Read entire file
-            
-        # Try Google Speech Recognition first
-        try:
-            result["text"] = r.recognize_google(audio)
-        except sr.UnknownValueError:
-            # Fallback to whisper (requires ffmpeg)
-            result["text"] = r.recognize_whisper(
-                audio,
-                model="small",
-                load_options=dict(device="cpu")
-            )
+        audio = decode_audio(source)
+        result["duration"] = audio["duration"]
+        if keep_audio:
+            result["audio"] = audio
+
+        # Local Whisper by default; chunks are cut at pauses and transcribed in order
+        result["segments"] = list(transcribe_stream(audio["samples"], backend=backend or config.TRANSCRIBE_BACKEND))
+        result["text"] = " ".join(seg["text"] for seg in result["segments"])
             
-    except sr.RequestError as e:
+    except ConnectionError as e:
         result["error"] = f"API unavailable: {str(e)}"
     except Exception as e:
         result["error"] = f"Transcription error: {str(e)}"
         
-    return result
\ No newline at end of file
+    return result
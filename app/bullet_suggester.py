@@ -1,11 +1,42 @@
-def suggest_resume_bullets(resume_lines, missing_keywords):
-    suggestions = []
+# app/bullet_suggester.py
+
+import numpy as np
+from app.embeddings import encode, cosine_matrix
+
+def suggest_resume_bullets(resume_lines, missing_keywords, line_embeddings=None, keyword_embeddings=None,
+                           reuse_penalty=0.1):
+    """
+    Pick the most relevant resume line for each missing JD keyword
+    Args:
+        resume_lines (list): Candidate lines (e.g. the bullets from parse_document)
+        missing_keywords (list): Keywords to work into the resume
+        line_embeddings (np.ndarray): Precomputed line embeddings (optional)
+        keyword_embeddings (np.ndarray): Precomputed keyword embeddings (optional)
+        reuse_penalty (float): Score subtracted per earlier suggestion on the same line,
+                               so one line isn't picked for every keyword
+    Returns:
+        list: (keyword, line, new_line) tuples, most confident first
+    """
+    resume_lines = list(resume_lines)
+    missing_keywords = list(missing_keywords)
+    if not resume_lines or not missing_keywords:
+        return []
 
-    for keyword in missing_keywords:
-        for line in resume_lines:
-            if any(term in line.lower() for term in ["project", "system", "model", "built", "designed"]):
-                new_line = f"{line} Incorporated keyword: '{keyword}' for alignment with JD."
-                suggestions.append((keyword, line, new_line))
-                break
+    # One matrix for every keyword/line pair instead of K x L substring scans
+    if line_embeddings is None:
+        line_embeddings = encode(resume_lines)
+    if keyword_embeddings is None:
+        keyword_embeddings = encode(missing_keywords)
+    similarity = cosine_matrix(keyword_embeddings, line_embeddings)
+
+    # Most confident keywords choose first; later ones see the penalty on used lines
+    uses = np.zeros(len(resume_lines), dtype=np.float32)
+    suggestions = []
+    for k in np.argsort(-similarity.max(axis=1), kind="stable"):
+        line_idx = int(np.argmax(similarity[k] - reuse_penalty * uses))
+        uses[line_idx] += 1
+        keyword, line = missing_keywords[k], resume_lines[line_idx]
+        new_line = f"{line} Incorporated keyword: '{keyword}' for alignment with JD."
+        suggestions.append((keyword, line, new_line))
 
     return suggestions
@@ -0,0 +1,94 @@
+# app/config.py
+
+import os
+
+# -----------------------------
+# Sentence Embeddings
+# -----------------------------
+# One model is shared by the keyword, resume and contextual evaluation modules
+EMBEDDING_MODEL = os.environ.get("SPEAKWISE_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+EMBEDDING_DEVICE = os.environ.get("SPEAKWISE_EMBEDDING_DEVICE") or None  # None = let torch pick
+EMBEDDING_BATCH_SIZE = int(os.environ.get("SPEAKWISE_EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_THREADS = int(os.environ.get("SPEAKWISE_EMBEDDING_THREADS", "0"))  # 0 = torch default
+
+# Content-addressed embedding cache in front of encode(); set SPEAKWISE_EMBEDDING_CACHE=0 to disable
+EMBEDDING_CACHE = os.environ.get("SPEAKWISE_EMBEDDING_CACHE", "1") != "0"
+CACHE_DIR = os.environ.get("SPEAKWISE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "speakwise"))
+EMBEDDING_CACHE_MEMORY_ITEMS = int(os.environ.get("SPEAKWISE_EMBEDDING_CACHE_MEMORY_ITEMS", "4096"))
+EMBEDDING_CACHE_DISK_ITEMS = int(os.environ.get("SPEAKWISE_EMBEDDING_CACHE_DISK_ITEMS", "50000"))
+
+# -----------------------------
+# NLTK Data
+# -----------------------------
+# Tokenizer/stopword data is read from this directory (plus NLTK's default
+# search path) and never downloaded at runtime. Populate it once with:
+#   python -m nltk.downloader -d nltk_data punkt punkt_tab stopwords
+NLTK_DATA_DIR = os.environ.get(
+    "SPEAKWISE_NLTK_DATA", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "nltk_data")
+)
+
+# -----------------------------
+# Speech Recognition
+# -----------------------------
+WHISPER_MODEL = os.environ.get("SPEAKWISE_WHISPER_MODEL", "small")
+WHISPER_DEVICE = os.environ.get("SPEAKWISE_WHISPER_DEVICE", "cpu")
+
+# Speech-to-text backend: "whisper" (local, offline) or "google" (network, falls back to whisper)
+TRANSCRIBE_BACKEND = os.environ.get("SPEAKWISE_TRANSCRIBE_BACKEND", "whisper")
+TRANSCRIBE_CHUNK_SECONDS = float(os.environ.get("SPEAKWISE_TRANSCRIBE_CHUNK_SECONDS", "30"))
+WHISPER_LANGUAGE = os.environ.get("SPEAKWISE_WHISPER_LANGUAGE", "en") or None
+
+# -----------------------------
+# Grammar Checking
+# -----------------------------
+GRAMMAR_LANGUAGE = os.environ.get("SPEAKWISE_GRAMMAR_LANGUAGE", "en-US")
+# URL of a running LanguageTool server (e.g. http://localhost:8081); unset = start a local JVM
+GRAMMAR_SERVER_URL = os.environ.get("SPEAKWISE_GRAMMAR_SERVER") or None
+# "full" runs every rule; "count" only the categories below (faster, for scoring)
+GRAMMAR_MODE = os.environ.get("SPEAKWISE_GRAMMAR_MODE", "full")
+GRAMMAR_COUNT_CATEGORIES = [
+    c.strip()
+    for c in os.environ.get("SPEAKWISE_GRAMMAR_COUNT_CATEGORIES", "GRAMMAR,CONFUSED_WORDS,COLLOCATIONS").split(",")
+    if c.strip()
+]
+# Requests arriving within this window share one LanguageTool round trip
+GRAMMAR_BATCH_WINDOW_MS = float(os.environ.get("SPEAKWISE_GRAMMAR_BATCH_WINDOW_MS", "20"))
+# Longest a caller waits for a batched check before giving up
+GRAMMAR_TIMEOUT_S = float(os.environ.get("SPEAKWISE_GRAMMAR_TIMEOUT_S", "60"))
+
+# -----------------------------
+# Warm-up
+# -----------------------------
+# Components primed by `streamlit run main.py -- --warmup` / `python main.py --warmup-only`
+WARMUP_COMPONENTS = [
+    c.strip()
+    for c in os.environ.get("SPEAKWISE_WARMUP", "embeddings,keybert,sentiment,grammar,whisper").split(",")
+    if c.strip()
+]
+
+# -----------------------------
+# Ideal-answer generation (LLM)
+# -----------------------------
+# Backend: "replicate" (remote), "transformers" or "llama_cpp" (local CPU), "fake" (offline, deterministic)
+LLM_BACKEND = os.environ.get("SPEAKWISE_LLM_BACKEND", "replicate")
+REPLICATE_LLM_MODEL = os.environ.get("SPEAKWISE_REPLICATE_MODEL", "meta/llama-2-13b-chat")
+LOCAL_LLM_MODEL = os.environ.get("SPEAKWISE_LOCAL_LLM_MODEL", "Qwen/Qwen2.5-0.5B-Instruct")
+LLAMA_CPP_MODEL_PATH = os.environ.get("SPEAKWISE_LLAMA_CPP_MODEL")  # path to a quantized .gguf file
+LLM_MAX_NEW_TOKENS = int(os.environ.get("SPEAKWISE_LLM_MAX_NEW_TOKENS", "300"))  # hard cap for local backends
+LLM_THREADS = int(os.environ.get("SPEAKWISE_LLM_THREADS", "0"))  # llama.cpp threads; 0 = its default
+# A local generation that produces no token for this long is abandoned
+LLM_TOKEN_TIMEOUT_S = float(os.environ.get("SPEAKWISE_LLM_TOKEN_TIMEOUT_S", "120"))
+LLM_CACHE_PATH = os.environ.get("SPEAKWISE_LLM_CACHE", os.path.join(CACHE_DIR, "llm_cache.sqlite3"))
+LLM_CACHE_TTL_S = float(os.environ.get("SPEAKWISE_LLM_CACHE_TTL_S", str(7 * 24 * 3600)))
+
+# -----------------------------
+# Document ingestion
+# -----------------------------
+# PDFs with at least this many pages per worker are decoded in parallel processes
+DOCUMENT_PARALLEL_MIN_PAGES = int(os.environ.get("SPEAKWISE_DOCUMENT_PARALLEL_MIN_PAGES", "16"))
+DOCUMENT_WORKERS = int(os.environ.get("SPEAKWISE_DOCUMENT_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# -----------------------------
+# Resume corpus index
+# -----------------------------
+RESUME_INDEX_DIR = os.environ.get("SPEAKWISE_RESUME_INDEX", os.path.join(CACHE_DIR, "resume_index"))
@@ -1,22 +1,28 @@
-import replicate
-import streamlit as st
+import threading
 import numpy as np
-from sentence_transformers import SentenceTransformer, util
-import nltk
-from nltk import sent_tokenize
-
-# Ensure NLTK punkt tokenizer is available
-nltk.download('punkt')
-
-# Load BERT model once
-bert_model = SentenceTransformer('all-MiniLM-L6-v2')
+import streamlit as st
+from app import config
+from app.embeddings import encode, cosine_matrix
+from app.llm_backends import get_backend
+from app.llm_cache import CoalescingGenerator, ResultCache, cache_key
+from app.nltk_resources import sent_tokenize
 
 
 # -----------------------------
-# 1. Generate Ideal Answer using LLaMA-2
+# 1. Generate Ideal Answer (Replicate LLaMA-2 or a local backend)
 # -----------------------------
-def generate_ideal_answers(jd_text):
-    prompt = f"""
+LLAMA_PARAMS = {
+    "temperature": 0.6,
+    "top_p": 0.9,
+    "max_new_tokens": 300,
+    "top_k": 10
+}
+
+_generator = None
+_generator_lock = threading.Lock()
+
+def _ideal_answer_prompt(jd_text):
+    return f"""
     You have to check wether the answer is aligned with the job description or not.
 
     Job Description:
@@ -25,54 +31,109 @@ def generate_ideal_answers(jd_text):
     Ideal Answer:
     """
 
+def _generation_params(backend):
+    """LLAMA_PARAMS with max_new_tokens lowered to the backend's cap, so the cache key matches what is generated"""
+    params = dict(LLAMA_PARAMS)
+    cap = getattr(backend, "max_new_tokens", None)
+    if cap:
+        params["max_new_tokens"] = min(params["max_new_tokens"], cap)
+    return params
+
+def get_generator():
+    """Process-wide cache + request coalescing for ideal answers"""
+    global _generator
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                _generator = CoalescingGenerator(ResultCache(config.LLM_CACHE_PATH, config.LLM_CACHE_TTL_S))
+    return _generator
+
+def stream_ideal_answer(jd_text, backend=None, raise_errors=False):
+    """
+    Stream the ideal answer token by token. Results are cached by prompt, model
+    and parameters, and identical concurrent requests share one backend call.
+    `backend` is a name from llm_backends.BACKENDS or any callable
+    backend(prompt, params) returning a token iterator (defaults to config.LLM_BACKEND).
+    Errors end the stream with an "[LLM Error] ..." token unless `raise_errors`
+    is set, in which case they propagate after the tokens already streamed.
+    """
+    prompt = _ideal_answer_prompt(jd_text)
     try:
-        output = replicate.run(
-            "meta/llama-2-13b-chat",
-            input={
-                "prompt": prompt,
-                "temperature": 0.6,
-                "top_p": 0.9,
-                "max_new_tokens": 300,
-                "top_k":10
-            }
-        )
-        return "".join(output)
+        if backend is None or isinstance(backend, str):
+            backend = get_backend(backend)
+        params = _generation_params(backend)
+        key = cache_key(prompt, getattr(backend, "model_name", repr(backend)), params)
+        yield from get_generator().stream(key, lambda: backend(prompt, params))
     except Exception as e:
-        return f"[LLaMA-2 Error] {e}"
+        if raise_errors:
+            raise
+        yield f"[LLM Error] {e}"
+
+def generate_ideal_answers(jd_text, backend=None):
+    return "".join(stream_ideal_answer(jd_text, backend))
 
 
 # -----------------------------
 # 2. Compute Semantic Similarity
 # -----------------------------
-def compute_similarity(user_answer, ideal_answer, threshold=0.4):
+def align_sentences(user_answer, ideal_answer, one_to_one=False):
+    """
+    Align every ideal-answer sentence with the user's sentences from one similarity matrix
+    Args:
+        user_answer (str): Candidate's answer
+        ideal_answer (str): Generated ideal answer
+        one_to_one (bool): Hungarian assignment, each user sentence covers at most one ideal sentence
+    Returns:
+        dict: ideal_sentences, user_sentences, scores (one per ideal sentence) and
+              best_user_index (user sentence index per ideal sentence, -1 if none)
+    """
     user_sentences = sent_tokenize(user_answer)
     ideal_sentences = sent_tokenize(ideal_answer)
+    scores = np.zeros(len(ideal_sentences), dtype=np.float32)
+    best = np.full(len(ideal_sentences), -1, dtype=np.int64)
 
-    user_embeddings = bert_model.encode(user_sentences, convert_to_tensor=True)
-    ideal_embeddings = bert_model.encode(ideal_sentences, convert_to_tensor=True)
+    if ideal_sentences and user_sentences:
+        sim = cosine_matrix(encode(ideal_sentences), encode(user_sentences))  # (ideal, user)
+        if one_to_one:
+            from scipy.optimize import linear_sum_assignment
 
-    matched = []
-    missing = []
-    sentence_scores = []
+            rows, cols = linear_sum_assignment(sim, maximize=True)
+            best[rows] = cols
+            scores[rows] = sim[rows, cols]
+        else:
+            best = sim.argmax(axis=1)
+            scores = sim[np.arange(len(ideal_sentences)), best]
+
+    return {
+        "ideal_sentences": ideal_sentences,
+        "user_sentences": user_sentences,
+        "scores": [float(x) for x in scores],
+        "best_user_index": [int(x) for x in best],
+    }
 
-    for i, ideal_emb in enumerate(ideal_embeddings):
-        scores = util.pytorch_cos_sim(ideal_emb, user_embeddings)[0]
-        max_score = scores.max().item()
-        sentence_scores.append(max_score)
 
-        if max_score >= threshold:
-            matched.append((ideal_sentences[i], max_score))
+def compute_similarity(user_answer, ideal_answer, threshold=0.4, one_to_one=False, return_alignment=False):
+    alignment = align_sentences(user_answer, ideal_answer, one_to_one=one_to_one)
+
+    matched = []
+    missing = []
+    for sentence, score in zip(alignment["ideal_sentences"], alignment["scores"]):
+        if score >= threshold:
+            matched.append((sentence, score))
         else:
-            missing.append((ideal_sentences[i], max_score))
+            missing.append((sentence, score))
 
-    return matched, missing, sentence_scores
+    if return_alignment:
+        return matched, missing, alignment["scores"], alignment
+    return matched, missing, alignment["scores"]
 
 
 # -----------------------------
 # 3. Visualize Alignment
 # -----------------------------
-def visualize_alignment(ideal_answer, sentence_scores, threshold=0.4):
-    ideal_sentences = sent_tokenize(ideal_answer)
+def visualize_alignment(ideal_answer, sentence_scores, threshold=0.4, ideal_sentences=None):
+    if ideal_sentences is None:
+        ideal_sentences = sent_tokenize(ideal_answer)
     output_html = ""
 
     for sentence, score in zip(ideal_sentences, sentence_scores):
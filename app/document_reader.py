@@ -0,0 +1,191 @@
+# app/document_reader.py
+#
+# Resume/JD ingestion: PDF and TXT files are decoded once per content hash
+# into text, logical lines (wrapped lines re-joined) and sentences, each
+# labelled with the resume section it belongs to.
+
+import hashlib
+import multiprocessing as mp
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from app import config
+from app.nltk_resources import sent_tokenize
+
+SUPPORTED_EXTENSIONS = (".pdf", ".txt")
+
+# Process-wide, so every Streamlit session (and rerun) shares parsed documents
+MAX_ENTRIES = 64
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+SECTION_HEADINGS = {
+    "summary", "profile", "objective", "about me", "education", "experience",
+    "work experience", "professional experience", "employment", "projects",
+    "skills", "technical skills", "certifications", "achievements", "awards",
+    "publications", "leadership", "activities", "extracurricular activities",
+    "interests", "languages", "volunteering", "responsibilities", "requirements",
+    "qualifications",
+}
+
+_BULLET = re.compile(r"^\s*[–—•●▪◦*·-]\s*")
+_TERMINAL = re.compile(r"[.!?:|]$")
+_LABEL = re.compile(r"^[A-Z][\w &/+-]{0,30}:\s")  # "Tools: ..." starts its own line
+_WRAP_MIN_CHARS = 60  # a line at least this long without end punctuation was probably wrapped
+
+
+# -----------------------------
+# Page decoding
+# -----------------------------
+def iter_pdf_pages(data, start=0, stop=None):
+    """Yield the text of each PDF page in [start, stop), decoding one page at a time"""
+    import fitz
+
+    with fitz.open(stream=bytes(data), filetype="pdf") as doc:
+        for number in range(start, len(doc) if stop is None else min(stop, len(doc))):
+            yield doc[number].get_text()
+
+def _page_range_text(data, start, stop):
+    return list(iter_pdf_pages(data, start, stop))
+
+def _pdf_page_count(data):
+    import fitz
+
+    with fitz.open(stream=bytes(data), filetype="pdf") as doc:
+        return len(doc)
+
+def read_pdf_pages(data, max_workers=None):
+    """
+    Text of every page. Long PDFs are split into page ranges decoded in
+    separate processes (PyMuPDF documents can't be shared between threads).
+    """
+    pages = _pdf_page_count(data)
+    workers = min(max_workers or config.DOCUMENT_WORKERS, pages // max(config.DOCUMENT_PARALLEL_MIN_PAGES, 1))
+    if workers <= 1:
+        return list(iter_pdf_pages(data))
+
+    step = -(-pages // workers)
+    data = bytes(data)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as pool:
+        parts = pool.map(_page_range_text, [data] * workers, range(0, pages, step), range(step, pages + step, step))
+        return [text for part in parts for text in part]
+
+def read_pdf(data):
+    """Text of every page of a PDF given as bytes, pages joined by newlines"""
+    return "\n".join(read_pdf_pages(data))
+
+
+# -----------------------------
+# Structure: logical lines, sections, sentences
+# -----------------------------
+def _section_heading(line):
+    words = line.strip().rstrip(":").lower()
+    return words if words in SECTION_HEADINGS else None
+
+def _logical_lines(page_texts):
+    """
+    Re-join lines that the PDF layout wrapped, tagging each with its section and page
+    Returns:
+        list: {"text", "section", "page", "bullet"} per logical line
+    """
+    lines = []
+    section = "header"
+    for page_number, page_text in enumerate(page_texts, 1):
+        for raw in page_text.splitlines():
+            text = raw.strip()
+            if not text:
+                continue
+            heading = _section_heading(text)
+            if heading:
+                section = heading
+                continue
+            bullet = bool(_BULLET.match(text))
+            if bullet:
+                text = _BULLET.sub("", text)
+            previous = lines[-1] if lines else None
+            continues = (
+                previous is not None and not bullet and previous["section"] == section
+                and not _LABEL.match(text) and (
+                    text[0].islower()
+                    or (len(previous["text"]) >= _WRAP_MIN_CHARS and not _TERMINAL.search(previous["text"]))
+                )
+            )
+            if continues:
+                previous["text"] += " " + text
+            else:
+                lines.append({"text": text, "section": section, "page": page_number, "bullet": bullet})
+    return lines
+
+def _structure(page_texts):
+    lines = _logical_lines(page_texts)
+    sentences = [
+        {"text": sentence, "section": line["section"], "page": line["page"]}
+        for line in lines
+        for sentence in sent_tokenize(line["text"])
+        if sentence.strip()
+    ]
+    return {
+        "text": "\n".join(page_texts),
+        "pages": len(page_texts),
+        "lines": lines,
+        "sentences": sentences,
+        "sections": list(OrderedDict.fromkeys(line["section"] for line in lines)),
+    }
+
+
+# -----------------------------
+# Public API
+# -----------------------------
+def _as_bytes(source, name):
+    if isinstance(source, (str, os.PathLike)):
+        name = name or os.fspath(source)
+        with open(source, "rb") as f:
+            return f.read(), name
+    if hasattr(source, "getvalue"):
+        return source.getvalue(), name or getattr(source, "name", None)
+    if hasattr(source, "read"):
+        return source.read(), name or getattr(source, "name", None)
+    return bytes(source), name
+
+def parse_document(source, name=None):
+    """
+    Parse a resume/JD file, memoized by content hash
+    Args:
+        source: File path, bytes or file-like object (e.g. a Streamlit upload)
+        name (str): File name used to pick the format when `source` is not a path
+    Returns:
+        dict: hash, text, pages, lines, sentences (each {"text", "section", "page"}) and sections
+    """
+    data, name = _as_bytes(source, name)
+    key = hashlib.sha256(data).hexdigest()
+    with _lock:
+        doc = _cache.get(key)
+        if doc is not None:
+            _cache.move_to_end(key)
+            return doc
+
+    ext = os.path.splitext(name or "")[1].lower()
+    if ext == ".pdf" or (not ext and data[:5] == b"%PDF-"):
+        page_texts = read_pdf_pages(data)
+    else:
+        page_texts = [data.decode("utf-8")]
+    doc = dict(_structure(page_texts), hash=key)
+
+    with _lock:
+        doc = _cache.setdefault(key, doc)
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return doc
+
+def read_document(source, name=None):
+    """Plain text of a resume/JD file (see parse_document)"""
+    return parse_document(source, name)["text"]
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,206 @@
+# app/embedding_cache.py
+
+import atexit
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def text_key(model_name, text):
+    """Content address of one embedding: hash of model name + text"""
+    return hashlib.sha1(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Two-level embedding cache keyed by model and text hash.
+
+    Level 1 is an in-memory LRU of numpy vectors. Level 2 is one SQLite table
+    (hash -> float32 vector, last use time) that several processes can share:
+    SQLite's file locking serializes writers, so concurrent Streamlit workers
+    or batch_eval processes never overwrite each other's entries. Both levels
+    are size bounded and evict the least recently used entry.
+    """
+
+    def __init__(self, model_name, cache_dir=None, memory_items=4096, disk_items=50000, flush_interval_s=30.0):
+        self.model_name = model_name
+        self.memory_items = memory_items
+        self.disk_items = disk_items
+        self.cache_dir = cache_dir
+        self.flush_interval_s = flush_interval_s
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        # Disk level: recency updates from hits are buffered and written by flush()
+        self._conn = None
+        self._touched = {}  # key -> last use time, not yet written
+        self._last_flush = time.monotonic()
+
+        if cache_dir:
+            safe_name = model_name.replace("/", "_")
+            self._db_path = os.path.join(cache_dir, f"{safe_name}.sqlite3")
+            self._open_disk()
+
+    # -----------------------------
+    # Disk store
+    # -----------------------------
+    def _open_disk(self):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._conn = sqlite3.connect(self._db_path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB, last_used REAL)"
+                )
+                self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+            atexit.register(self.flush)
+        except Exception as e:
+            print(f"Embedding cache open error, using memory only: {str(e)}")
+            self._conn = None
+
+    def _disk_get_many(self, keys):
+        found = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32).copy()
+        return found
+
+    def _disk_put_many(self, items):
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                [(key, np.ascontiguousarray(vector, dtype=np.float32).tobytes(), now) for key, vector in items],
+            )
+
+    def _evict(self):
+        size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        excess = size - self.disk_items
+        if excess > 0:
+            with self._conn:
+                # Oldest first, through the last_used index
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+            self._stats["evictions"] += excess
+
+    def _flush_locked(self):
+        if self._conn is None:
+            return
+        if self._touched:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = MAX(last_used, ?) WHERE key = ?",
+                    [(t, key) for key, t in self._touched.items()],
+                )
+            self._touched.clear()
+        self._evict()
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        """Write buffered recency updates and trim the disk level to `disk_items`"""
+        with self._lock:
+            try:
+                self._flush_locked()
+            except sqlite3.Error as e:
+                print(f"Embedding cache flush error: {str(e)}")
+
+    # -----------------------------
+    # Memory LRU
+    # -----------------------------
+    def _memory_put(self, key, vector):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, keys):
+        """Vectors for the keys found in memory, then (in one query) on disk"""
+        found = {}
+        on_disk = []
+        for key in keys:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                found[key] = vector
+            else:
+                on_disk.append(key)
+        if on_disk and self._conn is not None:
+            now = time.time()
+            for key, vector in self._disk_get_many(on_disk).items():
+                self._memory_put(key, vector)
+                self._touched[key] = now
+                self._stats["disk_hits"] += 1
+                found[key] = vector
+        return found
+
+    # -----------------------------
+    # Public API
+    # -----------------------------
+    def get_many(self, texts, encode_fn):
+        """
+        Return embeddings for `texts`, encoding only the ones not cached yet
+        Args:
+            texts (list): Strings to embed
+            encode_fn (callable): Batch encoder called once with the unique misses
+        Returns:
+            np.ndarray: float32 array of shape (len(texts), dim)
+        """
+        keys = [text_key(self.model_name, t) for t in texts]
+        unique = OrderedDict(zip(keys, texts))
+
+        with self._lock:
+            found = self._lookup(list(unique))
+        misses = OrderedDict((k, t) for k, t in unique.items() if k not in found)
+
+        if misses:
+            vectors = np.asarray(encode_fn(list(misses.values())), dtype=np.float32)
+            with self._lock:
+                self._stats["misses"] += len(misses)
+                for key, vector in zip(misses, vectors):
+                    found[key] = vector
+                    self._memory_put(key, vector)
+                if self._conn is not None:
+                    try:
+                        self._disk_put_many(zip(misses, vectors))
+                    except sqlite3.Error as e:
+                        print(f"Embedding cache write error: {str(e)}")
+
+        if self._conn is not None and time.monotonic() - self._last_flush > self.flush_interval_s:
+            self.flush()
+
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([found[k] for k in keys])
+
+    def stats(self):
+        """Hit/miss counters plus current sizes of both levels"""
+        with self._lock:
+            disk_size = 0
+            if self._conn is not None:
+                disk_size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return dict(self._stats, memory_size=len(self._memory), disk_size=disk_size)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM embeddings")
@@ -0,0 +1,106 @@
+# app/embeddings.py
+
+import os
+import threading
+
+from app import config
+
+_model = None
+_model_lock = threading.Lock()
+_cache = None
+
+
+def _set_num_threads(num_threads):
+    import torch
+
+    if num_threads and torch.get_num_threads() != num_threads:
+        torch.set_num_threads(num_threads)
+
+
+def get_model():
+    """Return the process-wide SentenceTransformer, loading it on first use"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                from sentence_transformers import SentenceTransformer
+
+                _set_num_threads(config.EMBEDDING_THREADS)
+                _model = SentenceTransformer(config.EMBEDDING_MODEL, device=config.EMBEDDING_DEVICE)
+    return _model
+
+
+def get_cache():
+    """Return the process-wide embedding cache, or None when disabled in config"""
+    global _cache
+    if _cache is None and config.EMBEDDING_CACHE:
+        with _model_lock:
+            if _cache is None:
+                from app.embedding_cache import EmbeddingCache
+
+                _cache = EmbeddingCache(
+                    config.EMBEDDING_MODEL,
+                    cache_dir=os.path.join(config.CACHE_DIR, "embeddings") if config.CACHE_DIR else None,
+                    memory_items=config.EMBEDDING_CACHE_MEMORY_ITEMS,
+                    disk_items=config.EMBEDDING_CACHE_DISK_ITEMS,
+                )
+    return _cache
+
+
+def encode(texts, batch_size=None, device=None, num_threads=None, convert_to_tensor=False, normalize=False,
+           use_cache=True):
+    """
+    Embed a string or a list of strings with the shared model
+    Args:
+        texts (str | list): Text(s) to embed
+        batch_size (int): Encoding batch size (defaults to config)
+        device (str): Override the model device for this call, e.g. "cpu"
+        num_threads (int): Torch intra-op thread count (process-wide setting)
+        convert_to_tensor (bool): Return a torch tensor instead of a numpy array
+        normalize (bool): L2-normalize the embeddings
+        use_cache (bool): Serve repeated texts from the embedding cache
+    Returns:
+        Embedding(s) with the same leading shape as `texts`
+    """
+    cache = get_cache() if use_cache else None
+    if cache is None:
+        model = get_model()
+        _set_num_threads(num_threads)
+        return model.encode(
+            texts,
+            batch_size=batch_size or config.EMBEDDING_BATCH_SIZE,
+            device=device,
+            convert_to_tensor=convert_to_tensor,
+            normalize_embeddings=normalize,
+            show_progress_bar=False,
+        )
+
+    import numpy as np
+
+    single = isinstance(texts, str)
+    batch = [texts] if single else list(texts)
+    # Only the texts the cache has never seen reach the model, in one batch
+    embeddings = cache.get_many(
+        batch,
+        lambda misses: encode(misses, batch_size, device, num_threads, use_cache=False),
+    )
+    if normalize and len(batch):
+        embeddings = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-8, None)
+    if single:
+        embeddings = embeddings[0]
+    if convert_to_tensor:
+        import torch
+
+        embeddings = torch.from_numpy(np.ascontiguousarray(embeddings))
+    return embeddings
+
+
+def cosine_matrix(a, b):
+    """Full cosine similarity matrix between two stacks of embeddings (rows of a x rows of b)"""
+    import numpy as np
+
+    a = np.atleast_2d(np.asarray(a, dtype=np.float32))
+    b = np.atleast_2d(np.asarray(b, dtype=np.float32))
+    a = a / np.clip(np.linalg.norm(a, axis=1, keepdims=True), 1e-8, None)
+    b = b / np.clip(np.linalg.norm(b, axis=1, keepdims=True), 1e-8, None)
+    return a @ b.T
@@ -7,12 +7,15 @@ def generate_feedback(metrics, matched_keywords, total_keywords):
     if metrics['sentiment'] == 'NEGATIVE':
         feedback.append("Your answer sounds negative. Try to sound more confident.")
 
-    if metrics['grammar_issues'] > 2:
+    if (metrics['grammar_issues'] or 0) > 2:
         feedback.append("Consider improving grammar and sentence structure.")
 
     if metrics['vocabulary_score'] < 4:
         feedback.append("Try using more diverse or descriptive vocabulary.")
 
+    if metrics.get('long_pause_count', 0) > 2:
+        feedback.append("You paused for 2+ seconds several times. Try to keep your answer flowing.")
+
     if len(matched_keywords) < total_keywords:
         missing = total_keywords - len(matched_keywords)
         feedback.append(f"Consider mentioning {missing} more relevant keyword(s) from the job description.")
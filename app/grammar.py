@@ -0,0 +1,257 @@
+# app/grammar.py
+#
+# Grammar checking for transcripts. Sentences are checked once and cached;
+# concurrent requests (e.g. several Streamlit sessions) are merged into a
+# single LanguageTool round trip by a background batcher.
+
+import bisect
+import hashlib
+import html
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from app import config
+
+# -----------------------------
+# LanguageTool instance
+# -----------------------------
+_UNSET = object()
+_tool = _UNSET
+_tool_lock = threading.Lock()
+
+def get_grammar_tool():
+    """
+    LanguageTool client, created on first use. Talks to the server at
+    config.GRAMMAR_SERVER_URL when set, otherwise starts a local JVM server.
+    """
+    global _tool
+    if _tool is _UNSET:
+        with _tool_lock:
+            if _tool is _UNSET:
+                try:
+                    import language_tool_python
+                    if config.GRAMMAR_SERVER_URL:
+                        _tool = language_tool_python.LanguageTool(
+                            config.GRAMMAR_LANGUAGE, remote_server=config.GRAMMAR_SERVER_URL
+                        )
+                    else:
+                        _tool = language_tool_python.LanguageTool(config.GRAMMAR_LANGUAGE)
+                except Exception as e:
+                    print(f"Grammar checker initialization error: {str(e)}")
+                    _tool = None
+    return _tool
+
+def grammar_server_url():
+    """
+    Base URL of the LanguageTool server this process talks to (its own local
+    JVM or config.GRAMMAR_SERVER_URL), so other processes can share it; None if unavailable
+    """
+    tool = get_grammar_tool()
+    if tool is None:
+        return None
+    url = getattr(tool, "url", None) or getattr(tool, "_url", None)
+    return url.rsplit("v2/", 1)[0] if url else None
+
+def _configure_rules(tool, mode):
+    """Full rule set, or only the categories in config.GRAMMAR_COUNT_CATEGORIES for "count" mode"""
+    if mode == "count":
+        tool.enabled_categories = set(config.GRAMMAR_COUNT_CATEGORIES)
+        tool.enabled_rules_only = True
+    else:
+        tool.enabled_categories = set()
+        tool.enabled_rules_only = False
+
+def _issue(match, sentence_offset):
+    return {
+        "offset": match.offset - sentence_offset,
+        "length": getattr(match, "errorLength", None) or getattr(match, "error_length", 0),
+        "message": match.message,
+        "rule_id": getattr(match, "ruleId", None) or getattr(match, "rule_id", None),
+        "category": match.category,
+        "replacements": list(match.replacements[:3]),
+    }
+
+def check_with_tool(sentences, mode):
+    """One LanguageTool round trip for all sentences; returns the issue list of each sentence"""
+    tool = get_grammar_tool()
+    if tool is None:
+        raise RuntimeError("grammar checker unavailable")
+
+    separator = "\n\n"
+    starts = []
+    offset = 0
+    for sentence in sentences:
+        starts.append(offset)
+        offset += len(sentence) + len(separator)
+
+    _configure_rules(tool, mode)
+    issues = [[] for _ in sentences]
+    for match in tool.check(separator.join(sentences)):
+        i = bisect.bisect_right(starts, match.offset) - 1
+        issues[i].append(_issue(match, starts[i]))
+    return issues
+
+
+# -----------------------------
+# Cross-request batching
+# -----------------------------
+class GrammarBatcher:
+    """
+    Collects check requests for up to `window_s` (or `max_chars` of text) and
+    sends the unique sentences of each mode to `check_fn` in one call.
+    """
+
+    def __init__(self, check_fn=check_with_tool, window_s=0.02, max_chars=20000):
+        self.check_fn = check_fn
+        self.window_s = window_s
+        self.max_chars = max_chars
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def submit(self, sentences, mode):
+        """Future resolving to the issue list of each sentence"""
+        if not self.is_alive:
+            raise RuntimeError("grammar batcher thread is not running")
+        future = Future()
+        self._queue.put((list(sentences), mode, future))
+        return future
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        chars = sum(len(s) for s in batch[0][0])
+        deadline = time.monotonic() + self.window_s
+        while chars < self.max_chars:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            chars += sum(len(s) for s in item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            by_mode = OrderedDict()
+            for sentences, mode, future in batch:
+                by_mode.setdefault(mode, []).append((sentences, future))
+
+            for mode, requests in by_mode.items():
+                # Each distinct sentence is checked once, however many requests contain it
+                unique = list(OrderedDict.fromkeys(s for sentences, _ in requests for s in sentences))
+                try:
+                    found = dict(zip(unique, self.check_fn(unique, mode))) if unique else {}
+                    results = [[found[s] for s in sentences] for sentences, _ in requests]
+                except BaseException as e:
+                    # Fail this batch's callers instead of leaving them waiting; keep serving
+                    for _, future in requests:
+                        if not future.done():
+                            future.set_exception(e if isinstance(e, Exception) else RuntimeError(repr(e)))
+                    if not isinstance(e, Exception):
+                        raise
+                    continue
+                for (_, future), result in zip(requests, results):
+                    if not future.done():
+                        future.set_result(result)
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+def get_batcher():
+    """Process-wide batcher; a new one replaces it if its thread has died"""
+    global _batcher
+    if _batcher is None or not _batcher.is_alive:
+        with _batcher_lock:
+            if _batcher is None or not _batcher.is_alive:
+                if _batcher is not None:
+                    print("Grammar batcher thread died, restarting it")
+                _batcher = GrammarBatcher(window_s=config.GRAMMAR_BATCH_WINDOW_MS / 1000)
+    return _batcher
+
+
+# -----------------------------
+# Per-sentence cache + public API
+# -----------------------------
+CACHE_SIZE = 5000
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _cache_key(sentence, mode):
+    return hashlib.sha1(f"{mode}\0{sentence}".encode("utf-8")).hexdigest()
+
+def check_sentences(sentences, mode=None, timeout=None):
+    """
+    Grammar issues for each sentence (cached; only unseen sentences reach LanguageTool)
+    Args:
+        sentences (list): Sentences to check
+        mode (str): "full" (all rules) or "count" (lightweight rule subset); defaults to config
+        timeout (float): Seconds to wait for the batched check (defaults to config);
+                         raises concurrent.futures.TimeoutError when exceeded
+    Returns:
+        list: One list of issue dicts (offset/length within the sentence, message,
+              rule_id, category, replacements) per sentence
+    """
+    mode = mode or config.GRAMMAR_MODE
+    timeout = config.GRAMMAR_TIMEOUT_S if timeout is None else timeout
+    keys = [_cache_key(s, mode) for s in sentences]
+    results = {}
+    misses = OrderedDict()
+    with _cache_lock:
+        for key, sentence in zip(keys, sentences):
+            if key in _cache:
+                _cache.move_to_end(key)
+                results[key] = _cache[key]
+            else:
+                misses[key] = sentence
+
+    if misses:
+        computed = get_batcher().submit(list(misses.values()), mode).result(timeout)
+        with _cache_lock:
+            for key, issues in zip(misses, computed):
+                results[key] = issues
+                _cache[key] = issues
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+
+    return [results[k] for k in keys]
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+def grammar_report(sentences, mode=None):
+    """Issue count plus flat issue details (with the sentence each belongs to)"""
+    details = []
+    for index, (sentence, issues) in enumerate(zip(sentences, check_sentences(sentences, mode))):
+        for issue in issues:
+            details.append(dict(issue, sentence_index=index, sentence=sentence))
+    return {"grammar_issues": len(details), "grammar_details": details}
+
+def highlight_html(sentence, issues):
+    """Sentence as HTML with every issue span underlined and its message as a tooltip"""
+    parts = []
+    position = 0
+    for issue in sorted(issues, key=lambda i: i["offset"]):
+        start, end = issue["offset"], issue["offset"] + issue["length"]
+        if start < position:
+            continue  # overlapping matches: keep the first
+        parts.append(html.escape(sentence[position:start]))
+        parts.append(
+            f'<span style="text-decoration: underline wavy red;" title="{html.escape(issue["message"])}">'
+            f'{html.escape(sentence[start:end])}</span>'
+        )
+        position = end
+    parts.append(html.escape(sentence[position:]))
+    return "".join(parts)
@@ -0,0 +1,75 @@
+# app/jd_analysis.py
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from app.embeddings import encode
+from app.keyword_extractor import extract_keywords
+from app.text_metrics import preprocess_text
+
+# Process-wide, so every Streamlit session (and rerun) shares the same entries
+MAX_ENTRIES = 32
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def jd_hash(jd_text):
+    return hashlib.sha256(jd_text.encode("utf-8")).hexdigest()
+
+
+def _entry(jd_text):
+    key = jd_hash(jd_text)
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+            return entry
+
+    # Cheap text artifacts are built eagerly, model outputs on demand
+    entry = {
+        "hash": key,
+        "match_text": preprocess_text(jd_text),
+    }
+    with _lock:
+        entry = _cache.setdefault(key, entry)
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return entry
+
+
+def analyze_jd(jd_text, with_keywords=True, top_n=20, raise_errors=False):
+    """
+    Memoized JD analysis keyed by content hash
+    Args:
+        jd_text (str): Raw job description
+        with_keywords (bool): Also run KeyBERT and embed the keywords
+        top_n (int): Number of keywords to extract
+        raise_errors (bool): Re-raise keyword extraction/embedding errors instead of
+                             returning an uncached entry with no keywords
+    Returns:
+        dict: hash, match_text (resume matcher input) and, if requested,
+              keywords + keyword_embeddings
+    """
+    entry = _entry(jd_text)
+    if with_keywords and entry.get("top_n") != top_n:
+        try:
+            keywords = extract_keywords(jd_text, top_n=top_n, raise_errors=True)
+            embeddings = encode(keywords) if keywords else np.zeros((0, 0), dtype=np.float32)
+        except Exception:
+            if raise_errors:
+                raise
+            # Not cached, so the next call retries instead of keeping "no keywords" for this JD
+            return dict(entry, keywords=[], keyword_embeddings=np.zeros((0, 0), dtype=np.float32))
+        with _lock:
+            entry.update(keywords=keywords, keyword_embeddings=embeddings, top_n=top_n)
+    return entry
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
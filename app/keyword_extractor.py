@@ -1,35 +1,35 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-import numpy as np
-import nltk
-nltk.download('punkt')
-from nltk import sent_tokenize
-from sentence_transformers import SentenceTransformer, util
-from keybert import KeyBERT
-import re
+from app.embeddings import encode, get_model, cosine_matrix
+from app.nltk_resources import sent_tokenize
+from app.text_metrics import clean_keyword_text, clean_transcript
 
-# Load models once
-kw_model = KeyBERT(model="all-MiniLM-L6-v2")
-semantic_model = SentenceTransformer('all-MiniLM-L6-v2')
+_kw_model = None
+
+def get_kw_model():
+    """KeyBERT wrapper around the shared embedding model, created on first use"""
+    global _kw_model
+    if _kw_model is None:
+        from keybert import KeyBERT
+        _kw_model = KeyBERT(model=get_model())
+    return _kw_model
 
 # -----------------------------
 # Extract Keywords from Text
 # -----------------------------
-def extract_keywords(text, top_n=20):
+def extract_keywords(text, top_n=20, raise_errors=False):
     """
     Extract keywords from raw text using KeyBERT
     Args:
         text (str): Input text to analyze
         top_n (int): Number of keywords to extract
+        raise_errors (bool): Re-raise extraction errors instead of returning []
     Returns:
         list: Extracted keywords
     """
     try:
-        # Clean text: remove punctuation except hyphens
-        cleaned_text = re.sub(r'[^\w\s-]', ' ', text.lower())
-        cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
+        cleaned_text = clean_keyword_text(text)
 
         # Extract keywords
-        keywords = kw_model.extract_keywords(
+        keywords = get_kw_model().extract_keywords(
             cleaned_text,
             keyphrase_ngram_range=(1, 2),
             stop_words='english',
@@ -47,18 +47,22 @@ def extract_keywords(text, top_n=20):
 
     except Exception as e:
         print(f"❌ Error extracting keywords: {str(e)}")
+        if raise_errors:
+            raise
         return []
 
 # -----------------------------
 # Semantic Matching Logic
 # -----------------------------
-def keyword_match(keywords, answer, threshold=0.35):
+def keyword_match(keywords, answer, threshold=0.35, keyword_embeddings=None, raise_errors=False):
     """
     Match keywords against answer using semantic similarity
     Args:
         keywords (list): Keywords to match against
         answer (str): User's transcript text
         threshold (float): Similarity threshold (0-1)
+        keyword_embeddings (np.ndarray): Precomputed keyword embeddings (optional)
+        raise_errors (bool): Re-raise matching errors instead of returning []
     Returns:
         list: Matched keywords
     """
@@ -69,7 +73,7 @@ def keyword_match(keywords, answer, threshold=0.35):
             return matched
 
         # Clean input lightly (retain structure)
-        answer_clean = re.sub(r'[^\w\s.,;!?]', '', answer.lower())
+        answer_clean = clean_transcript(answer.lower())
 
         # Break answer into chunks
         answer_chunks = sent_tokenize(answer_clean)
@@ -78,13 +82,14 @@ def keyword_match(keywords, answer, threshold=0.35):
             return matched
 
         # Generate embeddings
-        chunk_embeddings = semantic_model.encode(answer_chunks, convert_to_tensor=True)
-        keyword_embeddings = semantic_model.encode(keywords, convert_to_tensor=True)
+        chunk_embeddings = encode(answer_chunks)
+        if keyword_embeddings is None:
+            keyword_embeddings = encode(keywords)
 
         # Find matches
-        for i, kw_emb in enumerate(keyword_embeddings):
-            scores = util.pytorch_cos_sim(kw_emb, chunk_embeddings)[0]
-            if scores.max().item() >= threshold:
+        best_scores = cosine_matrix(keyword_embeddings, chunk_embeddings).max(axis=1)
+        for i, score in enumerate(best_scores):
+            if score >= threshold:
                 matched.append(keywords[i])
 
         print("✅ Matched Keywords:", matched)
@@ -92,4 +97,6 @@ def keyword_match(keywords, answer, threshold=0.35):
 
     except Exception as e:
         print(f"❌ Error in keyword matching: {str(e)}")
+        if raise_errors:
+            raise
         return []
\ No newline at end of file
@@ -0,0 +1,252 @@
+# app/llm_backends.py
+#
+# Text-generation backends for the ideal answer. A backend is called as
+# backend(prompt, params) and returns an iterator of text tokens; `model_name`
+# identifies it in cache keys. Select one with SPEAKWISE_LLM_BACKEND.
+
+import hashlib
+import queue
+import threading
+import time
+
+from app import config
+
+
+# -----------------------------
+# Per-backend latency / throughput
+# -----------------------------
+class BackendStats:
+    """Running totals for one backend (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.tokens = 0
+        self.seconds = 0.0
+        self.first_token_seconds = 0.0
+
+    def record(self, tokens, seconds, first_token_seconds, error=False):
+        with self._lock:
+            self.calls += 1
+            self.errors += error
+            self.tokens += tokens
+            self.seconds += seconds
+            self.first_token_seconds += first_token_seconds
+
+    def summary(self):
+        with self._lock:
+            calls = max(self.calls, 1)
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "tokens": self.tokens,
+                "avg_latency_s": round(self.seconds / calls, 3),
+                "avg_first_token_s": round(self.first_token_seconds / calls, 3),
+                "tokens_per_s": round(self.tokens / self.seconds, 1) if self.seconds else 0.0,
+            }
+
+
+class LLMBackend:
+    """Base class: subclasses implement _generate(prompt, params) as a token generator"""
+
+    model_name = "unknown"
+
+    def __init__(self):
+        self.stats = BackendStats()
+
+    def _generate(self, prompt, params):
+        raise NotImplementedError
+
+    def __call__(self, prompt, params):
+        start = time.perf_counter()
+        first_token = None
+        tokens = 0
+        error = False
+        try:
+            for token in self._generate(prompt, params):
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                tokens += 1
+                yield token
+        except Exception:
+            error = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stats.record(tokens, elapsed, first_token if first_token is not None else elapsed, error)
+
+
+# -----------------------------
+# Backends
+# -----------------------------
+class ReplicateBackend(LLMBackend):
+    """Remote model on Replicate (needs REPLICATE_API_TOKEN)"""
+
+    def __init__(self, model=None):
+        super().__init__()
+        self.model_name = model or config.REPLICATE_LLM_MODEL
+
+    def _generate(self, prompt, params):
+        import replicate
+
+        model_input = dict(params, prompt=prompt)
+        if hasattr(replicate, "stream"):
+            for event in replicate.stream(self.model_name, input=model_input):
+                yield str(event)
+        else:
+            yield from replicate.run(self.model_name, input=model_input)
+
+
+class TransformersBackend(LLMBackend):
+    """Local CPU generation with transformers; the token budget is capped by config"""
+
+    def __init__(self, model=None, max_new_tokens=None, token_timeout_s=None):
+        super().__init__()
+        self.model_name = model or config.LOCAL_LLM_MODEL
+        self.max_new_tokens = max_new_tokens or config.LLM_MAX_NEW_TOKENS
+        self.token_timeout_s = token_timeout_s or config.LLM_TOKEN_TIMEOUT_S
+        self._model = None
+        self._tokenizer = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from transformers import AutoModelForCausalLM, AutoTokenizer
+
+                    self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                    self._model = AutoModelForCausalLM.from_pretrained(self.model_name)
+                    self._model.eval()
+        return self._model, self._tokenizer
+
+    def _generate(self, prompt, params):
+        from transformers import StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+
+        model, tokenizer = self._load()
+        inputs = tokenizer(prompt, return_tensors="pt")
+        streamer = TextIteratorStreamer(
+            tokenizer, skip_prompt=True, skip_special_tokens=True, timeout=self.token_timeout_s
+        )
+        stop = threading.Event()
+        errors = []
+
+        class _StopWhenAbandoned(StoppingCriteria):
+            def __call__(self, input_ids, scores, **kwargs):
+                return stop.is_set()
+
+        def run():
+            # generate() raising must still end the stream, or the consumer waits forever
+            try:
+                model.generate(**kwargs)
+            except Exception as e:
+                errors.append(e)
+                streamer.end()
+
+        kwargs = dict(
+            inputs,
+            streamer=streamer,
+            stopping_criteria=StoppingCriteriaList([_StopWhenAbandoned()]),
+            max_new_tokens=min(params.get("max_new_tokens", self.max_new_tokens), self.max_new_tokens),
+            do_sample=params.get("temperature", 0) > 0,
+            temperature=params.get("temperature", 1.0),
+            top_p=params.get("top_p", 1.0),
+            top_k=params.get("top_k", 50),
+        )
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        try:
+            yield from streamer
+        except queue.Empty:
+            raise TimeoutError(f"{self.model_name} produced no token for {self.token_timeout_s}s") from None
+        finally:
+            stop.set()  # consumer gone or timed out: let generate() return
+        thread.join()
+        if errors:
+            raise errors[0]
+
+
+class LlamaCppBackend(LLMBackend):
+    """Local quantized GGUF model through llama-cpp-python"""
+
+    def __init__(self, model_path=None, max_new_tokens=None):
+        super().__init__()
+        self.model_path = model_path or config.LLAMA_CPP_MODEL_PATH
+        self.model_name = "llama.cpp:" + str(self.model_path)
+        self.max_new_tokens = max_new_tokens or config.LLM_MAX_NEW_TOKENS
+        self._llm = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._llm is None:
+            with self._lock:
+                if self._llm is None:
+                    if not self.model_path:
+                        raise RuntimeError("SPEAKWISE_LLAMA_CPP_MODEL is not set")
+                    from llama_cpp import Llama
+
+                    self._llm = Llama(model_path=self.model_path, n_threads=config.LLM_THREADS or None, verbose=False)
+        return self._llm
+
+    def _generate(self, prompt, params):
+        llm = self._load()
+        for chunk in llm(
+            prompt,
+            max_tokens=min(params.get("max_new_tokens", self.max_new_tokens), self.max_new_tokens),
+            temperature=params.get("temperature", 0.8),
+            top_p=params.get("top_p", 0.95),
+            top_k=params.get("top_k", 40),
+            stream=True,
+        ):
+            yield chunk["choices"][0]["text"]
+
+
+class FakeBackend(LLMBackend):
+    """Deterministic offline backend: the same prompt always gives the same answer"""
+
+    model_name = "fake"
+
+    def __init__(self, delay_s=0.0):
+        super().__init__()
+        self.delay_s = delay_s
+
+    def _generate(self, prompt, params):
+        digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:8]
+        text = (
+            f"I have hands-on experience with the core requirements of this role (ref {digest}). "
+            "I have delivered projects end to end and communicated results to stakeholders. "
+            "I am comfortable learning new tools quickly and working in a team."
+        )
+        for word in text.split(" ")[:params.get("max_new_tokens", config.LLM_MAX_NEW_TOKENS)]:
+            if self.delay_s:
+                time.sleep(self.delay_s)
+            yield word + " "
+
+
+BACKENDS = {
+    "replicate": ReplicateBackend,
+    "transformers": TransformersBackend,
+    "llama_cpp": LlamaCppBackend,
+    "fake": FakeBackend,
+}
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def get_backend(name=None):
+    """Shared backend instance by name (defaults to config.LLM_BACKEND)"""
+    name = name or config.LLM_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{name}' (choose from {', '.join(BACKENDS)})")
+    with _instances_lock:
+        if name not in _instances:
+            _instances[name] = BACKENDS[name]()
+        return _instances[name]
+
+
+def backend_stats():
+    """Latency and tokens/sec of every backend used in this process"""
+    with _instances_lock:
+        return {name: backend.stats.summary() for name, backend in _instances.items()}
@@ -0,0 +1,140 @@
+# app/llm_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+def cache_key(prompt, model, params):
+    """Content address of one generation request"""
+    payload = json.dumps({"prompt": prompt, "model": model, "params": params}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Persistent (SQLite) text cache with a time-to-live per entry"""
+
+    def __init__(self, path, ttl_s=7 * 24 * 3600):
+        self.path = path
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT, created REAL)"
+            )
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, created = row
+        if self.ttl_s is not None and time.time() - created > self.ttl_s:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            return None
+        return value
+
+    def set(self, key, value):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, created) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+
+    def purge_expired(self):
+        if self.ttl_s is None:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results WHERE created < ?", (time.time() - self.ttl_s,))
+
+
+class _Inflight:
+    """One running generation whose tokens any number of callers can follow"""
+
+    def __init__(self):
+        self.tokens = []
+        self.done = False
+        self.error = None
+        self.cond = threading.Condition()
+
+
+class CoalescingGenerator:
+    """
+    Cache + request coalescing in front of a streaming text generator.
+
+    Concurrent calls with the same key share a single backend call: the first
+    caller starts it on a background thread and every caller (including the
+    first) streams the same tokens as they arrive. Completed results are
+    stored in the ResultCache; failures are not cached.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _produce(self, key, inflight, token_stream):
+        try:
+            for token in token_stream():
+                with inflight.cond:
+                    inflight.tokens.append(token)
+                    inflight.cond.notify_all()
+        except Exception as e:
+            inflight.error = e
+        else:
+            self.cache.set(key, "".join(inflight.tokens))
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            with inflight.cond:
+                inflight.done = True
+                inflight.cond.notify_all()
+
+    def stream(self, key, token_stream):
+        """
+        Yield the text for `key` token by token
+        Args:
+            key (str): Cache key (see cache_key)
+            token_stream (callable): Zero-arg callable returning an iterator of tokens
+        """
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        with self._lock:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                # A generation may have completed between the cache check and here
+                cached = self.cache.get(key)
+                if cached is None:
+                    inflight = _Inflight()
+                    self._inflight[key] = inflight
+                    threading.Thread(
+                        target=self._produce, args=(key, inflight, token_stream), daemon=True
+                    ).start()
+        if inflight is None:
+            yield cached
+            return
+
+        position = 0
+        while True:
+            with inflight.cond:
+                while position == len(inflight.tokens) and not inflight.done:
+                    inflight.cond.wait()
+                new_tokens = inflight.tokens[position:]
+                done = inflight.done
+            position += len(new_tokens)
+            yield from new_tokens
+            if done and position == len(inflight.tokens):
+                break
+
+        if inflight.error is not None:
+            raise inflight.error
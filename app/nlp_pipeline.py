@@ -1,38 +1,248 @@
-import re
-import nltk
-import language_tool_python
-from nltk.corpus import stopwords
-from transformers import pipeline as hf_pipeline
-import textstat
-
-nltk.download('punkt', quiet=True)
-nltk.download('stopwords', quiet=True)
-
-# Initialize NLP tools
-try:
-    tool = language_tool_python.LanguageTool('en-US')
-except Exception as e:
-    print(f"Grammar checker initialization error: {str(e)}")
-    tool = None
-
-try:
-    sentiment_analyzer = hf_pipeline("sentiment-analysis")
-except Exception as e:
-    print(f"Sentiment analyzer initialization error: {str(e)}")
-    sentiment_analyzer = None
-
-FILLERS = {"um", "uh", "like", "you know", "actually", "basically", "so", "literally"}
-
-def analyze_transcript(text, duration_seconds=60):
-    """Analyze transcript with robust error handling"""
+import hashlib
+import threading
+from collections import OrderedDict
+from app.grammar import get_grammar_tool, grammar_report
+from app.nltk_resources import sent_tokenize
+from app.stages import run_stages
+from app.text_metrics import clean_transcript, lexical_metrics, tokenize_words
+
+# NLP tools are created on first use; a failed init is remembered as None
+# (the grammar tool lives in app.grammar with its own lock)
+_UNSET = object()
+_sentiment_analyzer = _UNSET
+_sentiment_lock = threading.Lock()
+
+def get_sentiment_analyzer():
+    """HuggingFace sentiment pipeline, created on first use"""
+    global _sentiment_analyzer
+    if _sentiment_analyzer is _UNSET:
+        with _sentiment_lock:
+            if _sentiment_analyzer is _UNSET:
+                try:
+                    from transformers import pipeline as hf_pipeline
+                    _sentiment_analyzer = hf_pipeline("sentiment-analysis")
+                except Exception as e:
+                    print(f"Sentiment analyzer initialization error: {str(e)}")
+                    _sentiment_analyzer = None
+    return _sentiment_analyzer
+
+# -----------------------------
+# Per-sentence result caches
+# -----------------------------
+# Sentiment results are cached by sentence hash, so editing a long transcript
+# only re-runs the model on the sentences that actually changed (grammar results
+# are cached the same way in app.grammar).
+SENTENCE_CACHE_SIZE = 5000
+
+_sentiment_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _sentence_key(sentence):
+    return hashlib.sha1(sentence.encode("utf-8")).hexdigest()
+
+def _cached_per_sentence(cache, sentences, compute_many):
+    """Look sentences up in `cache`, computing all unique misses with one compute_many() call"""
+    keys = [_sentence_key(s) for s in sentences]
+    results = {}
+    misses = OrderedDict()
+    with _cache_lock:
+        for key, sentence in zip(keys, sentences):
+            if key in cache:
+                cache.move_to_end(key)
+                results[key] = cache[key]
+            else:
+                misses[key] = sentence
+
+    if misses:
+        computed = compute_many(list(misses.values()))
+        with _cache_lock:
+            for key, value in zip(misses, computed):
+                results[key] = value
+                cache[key] = value
+            while len(cache) > SENTENCE_CACHE_SIZE:
+                cache.popitem(last=False)
+
+    return [results[k] for k in keys]
+
+def clear_cache():
+    """Drop cached sentiment results (grammar results are cleared with app.grammar.clear_cache)"""
+    with _cache_lock:
+        _sentiment_cache.clear()
+
+SENTIMENT_BATCH_SIZE = 8
+
+def _score_sentiment(analyzer, texts):
+    """Batched sentiment call; returns (label, score) per text"""
+    outputs = analyzer(texts, truncation=True, batch_size=SENTIMENT_BATCH_SIZE)
+    return [(out['label'], out['score']) for out in outputs]
+
+def _token_counts(analyzer, texts):
+    tokenizer = getattr(analyzer, "tokenizer", None)
+    if tokenizer is None:
+        return [max(1, round(len(t.split()) * 1.3)) for t in texts]
+    return [len(ids) for ids in tokenizer(texts, add_special_tokens=False)["input_ids"]]
+
+def _max_chunk_tokens(analyzer):
+    tokenizer = getattr(analyzer, "tokenizer", None)
+    limit = getattr(tokenizer, "model_max_length", 512) or 512
+    return min(limit, 512) - 2  # room for [CLS]/[SEP]
+
+# A chunk also ends after any sentence whose hash is divisible by this (about
+# one sentence in CHUNK_BOUNDARY_EVERY), so boundaries depend on content, not position
+CHUNK_BOUNDARY_EVERY = 6
+
+def _is_chunk_boundary(sentence):
+    return int(_sentence_key(sentence)[:8], 16) % CHUNK_BOUNDARY_EVERY == 0
+
+def _pack_chunks(analyzer, sentences):
+    """
+    Pack consecutive sentences into chunks that fit the model window, so the
+    whole answer is scored instead of the first 512 characters. Chunks end at
+    content-defined boundaries (see _is_chunk_boundary): editing one sentence
+    changes its own chunk, and a length change only shifts cuts up to the next
+    boundary, so the other chunks keep their cache keys.
+    Returns (chunks, token_count_per_chunk).
+    """
+    limit = _max_chunk_tokens(analyzer)
+    chunks, weights = [], []
+    current, current_tokens = [], 0
+
+    def flush():
+        nonlocal current, current_tokens
+        if current:
+            chunks.append(" ".join(current))
+            weights.append(current_tokens)
+            current, current_tokens = [], 0
+
+    for sentence, tokens in zip(sentences, _token_counts(analyzer, sentences)):
+        if tokens > limit:
+            # A single over-long sentence is split into word windows of ~limit tokens
+            flush()
+            words = sentence.split()
+            step = max(1, int(len(words) * limit / tokens))
+            for i in range(0, len(words), step):
+                piece = words[i:i + step]
+                chunks.append(" ".join(piece))
+                weights.append(max(1, round(tokens * len(piece) / len(words))))
+            continue
+        if current_tokens + tokens > limit:
+            flush()
+        current.append(sentence)
+        current_tokens += tokens
+        if _is_chunk_boundary(sentence):
+            flush()
+    flush()
+    return chunks, weights
+
+def _aggregate_sentiment(results, weights=None):
+    """Length-weighted mean signed score -> overall (label, score)"""
+    if weights is None:
+        weights = [1] * len(results)
+    signed = [score if label == 'POSITIVE' else -score for label, score in results]
+    mean = sum(s * w for s, w in zip(signed, weights)) / max(sum(weights), 1)
+    return ('POSITIVE' if mean >= 0 else 'NEGATIVE'), abs(mean)
+
+def sentence_sentiments(text):
+    """
+    Per-sentence sentiment for a transcript (cached per sentence)
+    Returns:
+        list: {"sentence", "label", "score"} for each sentence
+    """
+    analyzer = get_sentiment_analyzer()
+    clean_text = clean_transcript(text)
+    sentences = [sent for sent in sent_tokenize(clean_text) if sent.strip()]
+    if not (analyzer and sentences):
+        return []
+    results = _cached_per_sentence(
+        _sentiment_cache, sentences, lambda batch: _score_sentiment(analyzer, batch)
+    )
+    return [
+        {"sentence": sentence, "label": label, "score": round(score, 2)}
+        for sentence, (label, score) in zip(sentences, results)
+    ]
+
+# Pace bands (WPM) outside which the fluency score is penalized. Overall pace
+# counts pauses; articulation rate (speech only) runs faster, so its band is higher.
+PACE_RANGE_WPM = (100, 160)
+ARTICULATION_RANGE_WPM = (110, 190)
+
+# Seconds each stage may take (from the start of analysis) before its metrics are dropped
+STAGE_TIMEOUTS = {"grammar": 15.0, "sentiment": 15.0, "lexical": 5.0}
+
+# -----------------------------
+# Independent analysis stages
+# -----------------------------
+def _sentiment_stage(sentences, raise_errors=False):
+    if not sentences:
+        return {}
+    sentiment_analyzer = get_sentiment_analyzer()
+    if not sentiment_analyzer:
+        if raise_errors:
+            raise RuntimeError("Sentiment analyzer unavailable")
+        return {}
+    try:
+        # Token-bounded chunks cover the full answer in one batched call; chunks are
+        # cached like sentences and cut at content-defined boundaries, so an edit
+        # re-scores only the chunks between the boundaries around it
+        chunks, weights = _pack_chunks(sentiment_analyzer, sentences)
+        per_chunk = _cached_per_sentence(
+            _sentiment_cache, chunks, lambda batch: _score_sentiment(sentiment_analyzer, batch)
+        )
+        label, score = _aggregate_sentiment(per_chunk, weights)
+        return {"sentiment": label, "sentiment_score": round(score, 2)}
+    except Exception as e:
+        print(f"Sentiment analysis error: {str(e)}")
+        if raise_errors:
+            raise
+        return {}
+
+def _grammar_stage(sentences, raise_errors=False):
+    if not sentences:
+        return {}
+    if not get_grammar_tool():
+        if raise_errors:
+            raise RuntimeError("Grammar checker unavailable")
+        return {}
+    try:
+        # Per-sentence cached, batched with other sessions; details are kept for highlighting
+        return grammar_report(sentences)
+    except Exception as e:
+        print(f"Grammar check error: {str(e)}")
+        if raise_errors:
+            raise
+        return {}
+
+def _lexical_stage(words, sentence_count):
+    # Fillers (including multi-word ones), vocabulary and readability in one pass
+    result = lexical_metrics(words, sentence_count)
+    del result["word_count"]
+    return result
+
+def analyze_transcript(text, duration_seconds=60, timeouts=None, acoustics=None, raise_errors=False):
+    """
+    Analyze transcript with robust error handling.
+    `acoustics` (from app.acoustics.acoustic_metrics) replaces the typed duration
+    with the measured one and adds speaking time, pauses and articulation rate.
+    `timeouts` overrides STAGE_TIMEOUTS ({} = wait for every stage).
+    When the grammar check times out or is unavailable, grammar_issues is None
+    and grammar is left out of the fluency score rather than counted as zero issues.
+    `raise_errors` raises instead of returning default metrics when a stage fails
+    or its model is unavailable (headless scoring must not store defaults as scores).
+    """
     metrics = {
         "filler_count": 0,
         "sentiment": "NEUTRAL",
         "sentiment_score": 0.0,
         "grammar_issues": 0,
+        "grammar_details": [],
         "vocabulary_score": 0.0,
+        "filler_breakdown": {},
+        "type_token_ratio": 0.0,
+        "flesch_reading_ease": 0.0,
+        "flesch_kincaid_grade": 0.0,
         "speech_pace_wpm": 0.0,
-        "fluency_score": 0.0
+        "fluency_score": 0.0,
+        "incomplete_stages": []
     }
     
     if not text.strip():
@@ -40,40 +250,40 @@ def analyze_transcript(text, duration_seconds=60):
 
     try:
         # Clean text and basic processing
-        clean_text = re.sub(r'[^\w\s.,;!?]', '', text)
-        words = nltk.word_tokenize(clean_text.lower())
+        clean_text = clean_transcript(text)
+        words = tokenize_words(clean_text)
         num_words = len(words)
-        
-        # Filler Word Analysis
-        metrics["filler_count"] = sum(1 for word in words if word in FILLERS)
-
-        # Sentiment Analysis with fallback
-        if sentiment_analyzer:
-            try:
-                sentiment_result = sentiment_analyzer(clean_text[:512])[0]  # Truncate to model limit
-                metrics["sentiment"] = sentiment_result['label']
-                metrics["sentiment_score"] = round(sentiment_result['score'], 2)
-            except Exception as e:
-                print(f"Sentiment analysis error: {str(e)}")
-
-        # Grammar Check with fallback
-        if tool:
-            try:
-                matches = tool.check(clean_text)
-                metrics["grammar_issues"] = len(matches)
-            except Exception as e:
-                print(f"Grammar check error: {str(e)}")
-
-        # Vocabulary Analysis
-        try:
-            stop_words = set(stopwords.words("english"))
-            content_words = [w for w in words if w not in stop_words and w.isalpha()]
-            unique_words = set(content_words)
-            if unique_words:
-                avg_word_len = sum(len(w) for w in unique_words) / len(unique_words)
-                metrics["vocabulary_score"] = round(avg_word_len, 2)
-        except Exception as e:
-            print(f"Vocabulary analysis error: {str(e)}")
+        sentences = [sent for sent in sent_tokenize(clean_text) if sent.strip()]
+
+        # Grammar (out-of-process JVM), sentiment (torch) and lexical metrics are
+        # independent, so they overlap; a stage past its timeout leaves its defaults
+        results, status = run_stages(
+            {
+                "grammar": lambda: _grammar_stage(sentences, raise_errors),
+                "sentiment": lambda: _sentiment_stage(sentences, raise_errors),
+                "lexical": lambda: _lexical_stage(words, max(len(sentences), 1)),
+            },
+            timeouts=STAGE_TIMEOUTS if timeouts is None else timeouts,
+        )
+        for stage_metrics in results.values():
+            metrics.update(stage_metrics)
+        metrics["incomplete_stages"] = [name for name, state in status.items() if state != "ok"]
+        if raise_errors and metrics["incomplete_stages"]:
+            raise RuntimeError("Incomplete analysis: " + ", ".join(
+                f"{name} {status[name]}" for name in metrics["incomplete_stages"]
+            ))
+        if "grammar_issues" not in results.get("grammar", {}):
+            metrics["grammar_issues"] = None
+            if "grammar" not in metrics["incomplete_stages"]:
+                metrics["incomplete_stages"].append("grammar")
+
+        # Acoustic metrics measured on the waveform take precedence over the typed duration
+        if acoustics:
+            metrics.update(acoustics)
+            duration_seconds = acoustics["total_duration"] or duration_seconds
+            if acoustics["speaking_time"] > 0:
+                # Words per minute of actual speech, excluding pauses
+                metrics["articulation_rate_wpm"] = round(num_words / (acoustics["speaking_time"] / 60), 2)
 
         # Speech Pace Calculation
         try:
@@ -86,22 +296,32 @@ def analyze_transcript(text, duration_seconds=60):
         try:
             # Base score components
             filler_penalty = min(metrics["filler_count"] * 2, 20)  # Max 20% penalty
-            grammar_penalty = min(metrics["grammar_issues"], 15)    # Max 15% penalty
+            grammar_penalty = min(metrics["grammar_issues"] or 0, 15)    # Max 15% penalty; 0 when unchecked
+            pause_penalty = min(metrics.get("long_pause_count", 0) * 3, 15)  # Max 15% penalty
             pace_penalty = 0
-            
-            # Ideal WPM range: 110-150
-            if metrics["speech_pace_wpm"] < 100:
-                pace_penalty = (100 - metrics["speech_pace_wpm"]) * 0.2
-            elif metrics["speech_pace_wpm"] > 160:
-                pace_penalty = (metrics["speech_pace_wpm"] - 160) * 0.2
+
+            # With acoustics, pace is judged on articulation rate: long pauses already
+            # cost pause_penalty and must not be penalized again as a slow overall pace
+            if "articulation_rate_wpm" in metrics:
+                pace, (low, high) = metrics["articulation_rate_wpm"], ARTICULATION_RANGE_WPM
+            else:
+                pace, (low, high) = metrics["speech_pace_wpm"], PACE_RANGE_WPM
+            if pace < low:
+                pace_penalty = (low - pace) * 0.2
+            elif pace > high:
+                pace_penalty = (pace - high) * 0.2
                 
-            total_penalty = filler_penalty + grammar_penalty + pace_penalty
+            total_penalty = filler_penalty + grammar_penalty + pause_penalty + pace_penalty
             metrics["fluency_score"] = max(0, 100 - total_penalty)
             
         except Exception as e:
             print(f"Fluency calculation error: {str(e)}")
+            if raise_errors:
+                raise
 
     except Exception as e:
         print(f"General analysis error: {str(e)}")
+        if raise_errors:
+            raise
 
     return metrics
\ No newline at end of file
@@ -0,0 +1,44 @@
+# app/nltk_resources.py
+
+import re
+import threading
+
+from app import config
+
+_configured = False
+_lock = threading.Lock()
+_warned = set()
+
+_SENTENCE_FALLBACK = re.compile(r"(?<=[.!?])\s+")
+
+
+def _nltk():
+    """Import nltk and point it at the local data dir (no downloads, ever)"""
+    global _configured
+    import nltk
+
+    if not _configured:
+        with _lock:
+            if not _configured:
+                if config.NLTK_DATA_DIR and config.NLTK_DATA_DIR not in nltk.data.path:
+                    nltk.data.path.insert(0, config.NLTK_DATA_DIR)
+                _configured = True
+    return nltk
+
+
+def _warn_missing(resource):
+    # Also remembers the resource as missing, so later calls skip the failing lookup
+    if resource not in _warned:
+        _warned.add(resource)
+        print(f"NLTK '{resource}' data not found (looked in {config.NLTK_DATA_DIR}), using fallback")
+
+
+def sent_tokenize(text):
+    """nltk.sent_tokenize backed by local data, with a regex fallback"""
+    if "punkt" in _warned:
+        return [s for s in _SENTENCE_FALLBACK.split(text.strip()) if s]
+    try:
+        return _nltk().sent_tokenize(text)
+    except LookupError:
+        _warn_missing("punkt")
+        return [s for s in _SENTENCE_FALLBACK.split(text.strip()) if s]
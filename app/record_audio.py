@@ -1,39 +1,238 @@
 # app/record_audio.py
 
-import sounddevice as sd
-import soundfile as sf
 import numpy as np
+import queue
+import threading
 import time
-from datetime import datetime
-import os
 
-def record_audio(duration=10, sample_rate=16000, channels=1):
-    """Record audio from microphone and save as WAV file"""
-    try:
-        # Create recordings directory if not exists
-        os.makedirs("recordings", exist_ok=True)
-        
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"recordings/recording_{timestamp}.wav"
-        
-        # Show recording indicator
-        print(f"🎤 Recording for {duration} seconds...")
-        
-        # Record audio
-        audio_data = sd.rec(
-            int(duration * sample_rate),
-            samplerate=sample_rate,
-            channels=channels,
-            dtype=np.int16
+
+# -----------------------------
+# Streaming (non-blocking) recording
+# -----------------------------
+class RingBuffer:
+    """Fixed-capacity float32 ring buffer; keeps the most recent `capacity` samples"""
+
+    def __init__(self, capacity):
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self._write = 0
+        self._filled = 0
+
+    def write(self, samples):
+        samples = samples[-len(self._data):]
+        n = len(samples)
+        first = min(n, len(self._data) - self._write)
+        self._data[self._write:self._write + first] = samples[:first]
+        self._data[:n - first] = samples[first:]
+        self._write = (self._write + n) % len(self._data)
+        self._filled = min(self._filled + n, len(self._data))
+
+    def read_all(self):
+        """Buffered samples in chronological order"""
+        if self._filled < len(self._data):
+            return self._data[:self._filled].copy()
+        return np.concatenate([self._data[self._write:], self._data[:self._write]])
+
+
+def _sounddevice_stream(**kwargs):
+    import sounddevice as sd
+    return sd.InputStream(**kwargs)
+
+
+class StreamingRecorder:
+    """
+    Microphone recorder driven by an InputStream callback: audio lands in a ring
+    buffer (and a chunk queue for live consumers) while the caller stays free.
+    Recording runs until stop() is called or max_seconds elapse.
+
+    `stream_factory` builds the input stream (default: sounddevice.InputStream);
+    pass e.g. ArrayInputStream.factory(samples) to run without a sound card.
+    """
+
+    def __init__(self, sample_rate=16000, channels=1, max_seconds=600, block_ms=100, stream_factory=None):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.max_seconds = max_seconds
+        self.blocksize = int(sample_rate * block_ms / 1000)
+        self.stream_factory = stream_factory or _sounddevice_stream
+        self._ring = RingBuffer(int(max_seconds * sample_rate))
+        self._chunks = queue.Queue()
+        self._lock = threading.Lock()
+        self._stream = None
+        self._frames = 0
+        self.status_messages = []
+
+    def _callback(self, indata, frames, time_info, status):
+        if status:
+            self.status_messages.append(str(status))
+        mono = indata.mean(axis=1) if indata.ndim > 1 else indata
+        mono = np.asarray(mono, dtype=np.float32).copy()  # indata is reused by the driver
+        with self._lock:
+            self._ring.write(mono)
+            self._frames += len(mono)
+        self._chunks.put(mono)
+        if self._frames >= self.max_seconds * self.sample_rate:
+            raise _stop_callback()
+
+    @property
+    def is_recording(self):
+        return self._stream is not None and bool(getattr(self._stream, "active", True))
+
+    @property
+    def elapsed(self):
+        return self._frames / float(self.sample_rate)
+
+    def start(self):
+        self._stream = self.stream_factory(
+            samplerate=self.sample_rate,
+            channels=self.channels,
+            dtype="float32",
+            blocksize=self.blocksize,
+            callback=self._callback,
         )
-        sd.wait()  # Wait until recording is finished
-        
-        # Save as WAV file
-        sf.write(filename, audio_data, sample_rate)
-        print(f"✅ Saved recording to: {filename}")
-        return filename
-        
-    except Exception as e:
-        print(f"❌ Recording failed: {str(e)}")
-        return None
\ No newline at end of file
+        self._stream.start()
+        return self
+
+    def read_chunks(self):
+        """Non-blocking: all audio captured since the last call (may be empty)"""
+        chunks = []
+        while True:
+            try:
+                chunks.append(self._chunks.get_nowait())
+            except queue.Empty:
+                break
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+
+    def stop(self):
+        """Stop capturing; returns the recorded signal (most recent max_seconds)"""
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+        with self._lock:
+            return self._ring.read_all()
+
+
+def _stop_callback():
+    try:
+        import sounddevice as sd
+        return sd.CallbackStop
+    except Exception:
+        return ArrayInputStream.CallbackStop
+
+
+class ArrayInputStream:
+    """
+    Stand-in for sounddevice.InputStream that plays a numpy array through the
+    callback from a background thread (for headless machines and tests).
+    """
+
+    class CallbackStop(Exception):
+        pass
+
+    def __init__(self, samples, samplerate, channels, dtype, blocksize, callback, realtime=False):
+        self.samples = np.asarray(samples, dtype=np.float32)
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        self.callback = callback
+        self.realtime = realtime
+        self.active = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def factory(cls, samples, realtime=False):
+        return lambda **kwargs: cls(samples, realtime=realtime, **kwargs)
+
+    def _run(self):
+        for start in range(0, len(self.samples), self.blocksize):
+            if self._stop.is_set():
+                break
+            block = self.samples[start:start + self.blocksize].reshape(-1, 1)
+            try:
+                self.callback(block, len(block), None, None)
+            except Exception:
+                break
+            if self.realtime:
+                time.sleep(len(block) / self.samplerate)
+        self.active = False
+
+    def start(self):
+        self.active = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def wait(self):
+        self._thread.join()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.active = False
+
+    def close(self):
+        pass
+
+
+class LiveTranscription:
+    """
+    Record and transcribe at the same time: a background thread drains the
+    recorder's chunks into a StreamingTranscriber, so partial text is available
+    (via .text / .segments) while recording continues.
+    """
+
+    def __init__(self, recorder=None, transcriber=None, poll_s=0.25):
+        from app.transcription import StreamingTranscriber
+
+        self.recorder = recorder or StreamingRecorder()
+        self.transcriber = transcriber or StreamingTranscriber()
+        self.poll_s = poll_s
+        self.error = None
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def text(self):
+        return self.transcriber.text
+
+    @property
+    def segments(self):
+        return list(self.transcriber.segments)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            chunk = self.recorder.read_chunks()
+            if len(chunk):
+                try:
+                    self.transcriber.feed(chunk)
+                except Exception as e:
+                    self.error = str(e)
+                    return
+            else:
+                self._stopped.wait(self.poll_s)
+
+    def start(self):
+        self.recorder.start()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop recording, finish transcription; returns a transcribe_audio-style result"""
+        samples = self.recorder.stop()
+        self._stopped.set()
+        self._thread.join()
+        try:
+            if self.error is None:
+                rest = self.recorder.read_chunks()
+                if len(rest):
+                    self.transcriber.feed(rest)
+                self.transcriber.finish()
+        except Exception as e:
+            self.error = str(e)
+        return {
+            "text": self.transcriber.text,
+            "duration": self.recorder.elapsed,
+            "segments": self.segments,
+            "error": f"Transcription error: {self.error}" if self.error else None,
+            "audio": {"samples": samples, "sample_rate": self.recorder.sample_rate,
+                      "duration": len(samples) / float(self.recorder.sample_rate), "source_rate": self.recorder.sample_rate},
+        }
@@ -0,0 +1,286 @@
+# app/resume_index.py
+
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from app import config
+from app.document_reader import SUPPORTED_EXTENSIONS, parse_document, read_document
+from app.embeddings import encode
+from app.nltk_resources import sent_tokenize
+from app.resume_matcher import extract_missing_keywords, preprocess_text
+
+
+def chunk_text(text, max_words=60):
+    """Group consecutive sentences into chunks of at most ~max_words words"""
+    chunks, current, length = [], [], 0
+    for sentence in sent_tokenize(" ".join(text.split())):
+        words = len(sentence.split())
+        if current and length + words > max_words:
+            chunks.append(" ".join(current))
+            current, length = [], 0
+        current.append(sentence)
+        length += words
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _embed(texts):
+    # Resume chunks are stored in the index itself, so they bypass the shared embedding cache
+    return np.asarray(encode(texts, normalize=True, use_cache=False), dtype=np.float32)
+
+
+class ResumeIndex:
+    """
+    Persistent chunk-level embedding index over a folder of resumes.
+
+    Each resume is split into sentence chunks whose normalized embeddings are
+    rows of one float32 matrix. The rows live in an append-only file
+    (`embeddings.f32`); `index.json` maps each resume, keyed by its path
+    relative to the indexed folder, to its content hash and row range. New
+    resumes are embedded in batches and their rows appended, so refreshing
+    touches only new or changed files. Rows of replaced or deleted resumes
+    are skipped and reclaimed by one rewrite once they outnumber live rows.
+    Ranking is one matrix product between JD chunks and all resume chunks.
+    """
+
+    VERSION = 2
+
+    def __init__(self, index_dir=None, max_words=60, batch_size=32):
+        self.index_dir = index_dir or config.RESUME_INDEX_DIR
+        self.max_words = max_words
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self.root = None     # folder the resume paths are relative to
+        self.resumes = {}    # relative path -> {"sha1", "start", "end"} (row range)
+        self._stored = np.zeros((0, 0), dtype=np.float32)  # rows already in embeddings.f32
+        self._pending = []   # row blocks not written yet
+        self._matrix = None  # stored + pending, built on demand
+        self._load()
+
+    # -----------------------------
+    # Persistence
+    # -----------------------------
+    @property
+    def _rows_path(self):
+        return os.path.join(self.index_dir, "embeddings.f32")
+
+    @property
+    def _meta_path(self):
+        return os.path.join(self.index_dir, "index.json")
+
+    def _load(self):
+        if not (os.path.exists(self._rows_path) and os.path.exists(self._meta_path)):
+            return
+        try:
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != self.VERSION or meta.get("model") != config.EMBEDDING_MODEL:
+                print("Resume index was built by another version or embedding model, starting empty")
+                return
+            rows = np.memmap(self._rows_path, dtype=np.float32, mode="r")
+            self._stored = rows[:meta["rows"] * meta["dim"]].reshape(meta["rows"], meta["dim"])
+            self.root = meta["root"]
+            self.resumes = meta["resumes"]
+        except Exception as e:
+            print(f"Resume index load error, starting empty: {str(e)}")
+            self.root, self.resumes = None, {}
+            self._stored = np.zeros((0, 0), dtype=np.float32)
+
+    def _rows(self):
+        """All rows, stored and pending (caller holds the lock)"""
+        if self._matrix is None:
+            blocks = [b for b in [self._stored] + self._pending if len(b)]
+            self._matrix = np.concatenate(blocks) if len(blocks) > 1 else (
+                blocks[0] if blocks else np.zeros((0, 0), dtype=np.float32)
+            )
+        return self._matrix
+
+    def _row_count(self):
+        """Number of stored + pending rows, without building the matrix"""
+        return len(self._stored) + sum(len(block) for block in self._pending)
+
+    def _live_rows(self):
+        return sum(entry["end"] - entry["start"] for entry in self.resumes.values())
+
+    def save(self):
+        """Append pending rows (or compact the file when most rows are dead) and write the index"""
+        with self._lock:
+            os.makedirs(self.index_dir, exist_ok=True)
+            matrix = self._rows()
+            live = self._live_rows()
+            if len(matrix) > 2 * live and len(matrix) - live > 1024:
+                # Compact: keep only live rows, in resume order
+                order = sorted(self.resumes.items(), key=lambda item: item[1]["start"])
+                kept = [matrix[e["start"]:e["end"]] for _, e in order]
+                matrix = np.concatenate(kept) if kept else np.zeros((0, matrix.shape[1]), dtype=np.float32)
+                position = 0
+                for _, entry in order:
+                    size = entry["end"] - entry["start"]
+                    entry["start"], entry["end"] = position, position + size
+                    position += size
+                tmp_rows = self._rows_path + ".tmp"
+                matrix.tofile(tmp_rows)
+                os.replace(tmp_rows, self._rows_path)
+            elif self._pending:
+                with open(self._rows_path, "ab") as f:
+                    # Drop rows a crashed run appended without recording them in index.json
+                    f.truncate(self._stored.size * 4)
+                    for block in self._pending:
+                        np.ascontiguousarray(block, dtype=np.float32).tofile(f)
+            self._pending = []
+            self._stored, self._matrix = matrix, matrix
+
+            tmp_meta = self._meta_path + ".tmp"
+            with open(tmp_meta, "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": self.VERSION, "model": config.EMBEDDING_MODEL, "root": self.root,
+                    "rows": len(matrix), "dim": int(matrix.shape[1]) if matrix.ndim == 2 else 0,
+                    "resumes": self.resumes,
+                }, f)
+            os.replace(tmp_meta, self._meta_path)
+
+    # -----------------------------
+    # Building
+    # -----------------------------
+    def _add_batch(self, batch):
+        """Embed the chunks of several resumes in one call and append their rows"""
+        chunks = [chunk for _, _, resume_chunks in batch for chunk in resume_chunks]
+        vectors = _embed(chunks)
+        with self._lock:
+            position = self._row_count()
+            for name, sha1, resume_chunks in batch:
+                size = len(resume_chunks)
+                self.resumes[name] = {"sha1": sha1, "start": position, "end": position + size}
+                position += size
+            self._pending.append(vectors)
+            self._matrix = None
+
+    def remove(self, name):
+        """Forget one resume (its rows become dead until the next compaction)"""
+        with self._lock:
+            return self.resumes.pop(name, None) is not None
+
+    def add_folder(self, folder):
+        """
+        Bring the index in line with every PDF/TXT under `folder` (recursively)
+        Returns:
+            tuple: (added, unchanged, removed, errors) counts
+        """
+        root = self.root = os.path.abspath(folder)
+
+        added = unchanged = errors = 0
+        seen = set()
+        batch = []
+        for directory, sub_dirs, file_names in os.walk(root):
+            sub_dirs.sort()
+            for file_name in sorted(file_names):
+                if not file_name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    continue
+                path = os.path.join(directory, file_name)
+                name = os.path.relpath(path, root).replace(os.sep, "/")
+                seen.add(name)
+                try:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    sha1 = hashlib.sha1(data).hexdigest()
+                    entry = self.resumes.get(name)
+                    if entry is not None and entry["sha1"] == sha1:
+                        unchanged += 1
+                        continue
+                    text = read_document(data, name=file_name)
+                    batch.append((name, sha1, chunk_text(text, self.max_words) or [text]))
+                    added += 1
+                except Exception as e:
+                    print(f"❌ Could not index {name}: {str(e)}")
+                    errors += 1
+                if len(batch) >= self.batch_size:
+                    self._add_batch(batch)
+                    batch = []
+        if batch:
+            self._add_batch(batch)
+
+        # Files deleted (or outside the folder now indexed) leave the index
+        removed = [name for name in self.resumes if name not in seen]
+        for name in removed:
+            self.remove(name)
+
+        if added or removed:
+            self.save()
+        return added, unchanged, len(removed), errors
+
+    # -----------------------------
+    # Querying
+    # -----------------------------
+    def _read(self, name, sha1):
+        """Parsed document of an indexed resume, or None if the file is gone or changed since indexing"""
+        try:
+            with open(os.path.join(self.root, name), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if hashlib.sha1(data).hexdigest() != sha1:
+            return None
+        return parse_document(data, name=name)
+
+    def rank(self, jd_text, top_n=10, gaps_top_k=10):
+        """
+        Top-N resumes for a job description
+        Args:
+            jd_text (str): Job description
+            top_n (int): Number of resumes to return
+            gaps_top_k (int): Missing JD keywords per returned resume (0 to skip)
+        Returns:
+            list: dicts with name (path relative to the indexed folder), score (0-100),
+                  best_chunk and missing_keywords, best first
+        """
+        with self._lock:
+            resumes = sorted(self.resumes.items(), key=lambda item: item[1]["start"])
+            embeddings = self._rows()
+        if not resumes or top_n <= 0:
+            return []
+
+        jd_chunks = chunk_text(jd_text, self.max_words) or [jd_text]
+        sim = _embed(jd_chunks) @ embeddings.T  # (jd chunks, all rows)
+
+        # Rows of replaced/removed resumes can sit between live ranges; they never win a max
+        live = np.zeros(len(embeddings), dtype=bool)
+        for _, entry in resumes:
+            live[entry["start"]:entry["end"]] = True
+        sim[:, ~live] = -np.inf
+
+        # Best resume chunk for every JD chunk, per resume, then averaged over the JD
+        starts = np.array([entry["start"] for _, entry in resumes])
+        per_resume = np.maximum.reduceat(sim, starts, axis=1)  # (jd chunks, resumes)
+        scores = per_resume.mean(axis=0)
+
+        k = min(top_n, len(resumes))
+        top_idx = np.argpartition(-scores, k - 1)[:k]
+        top_idx = top_idx[np.argsort(-scores[top_idx], kind="stable")]
+
+        jd_clean = preprocess_text(jd_text) if gaps_top_k else None
+        ranked = []
+        for i in top_idx:
+            name, entry = resumes[i]
+            # Text is re-read for the top-N only; the index itself stores no resume text
+            doc = self._read(name, entry["sha1"])
+            text = doc["text"] if doc else None
+            chunks = (chunk_text(text, self.max_words) or [text]) if text else []
+            best_chunk = int(sim[:, entry["start"]:entry["end"]].max(axis=0).argmax())
+            ranked.append({
+                "name": name,
+                "score": round(float(scores[i]) * 100, 2),
+                "best_chunk": chunks[best_chunk] if best_chunk < len(chunks) else None,
+                "missing_keywords": extract_missing_keywords(
+                    text, jd_text, top_k=gaps_top_k, return_scores=True, jd_clean=jd_clean,
+                    resume_sentences=[s["text"] for s in doc["sentences"]]
+                ) if gaps_top_k and text else [],
+            })
+        return ranked
+
+    def __len__(self):
+        return len(self.resumes)
@@ -1,67 +1,101 @@
 # app/resume_matcher.py
 
-import re
-import nltk
-from nltk.corpus import stopwords
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
+from app.embeddings import encode, cosine_matrix
+from app.text_metrics import preprocess_text
 
-nltk.download('stopwords')
+def keyword_coverage(jd_keywords, resume_sentences, threshold=0.7):
+    """
+    Score every JD keyword against every resume sentence with one similarity matrix
+    Args:
+        jd_keywords (list): Keywords from the job description
+        resume_sentences (list): Sentences from the resume
+        threshold (float): Similarity needed to count a keyword as matched
+    Returns:
+        list: One dict per keyword with its best-matching sentence and score
+    """
+    jd_keywords = list(jd_keywords)
+    resume_sentences = list(resume_sentences)
+    if not jd_keywords:
+        return []
+    if not resume_sentences:
+        return [{"keyword": kw, "matched": False, "sentence": None, "score": 0.0} for kw in jd_keywords]
 
-stop_words = set(stopwords.words('english'))
-model = SentenceTransformer('all-MiniLM-L6-v2')  # Small and fast, good for similarity tasks
+    # Two batched encodes instead of one forward pass per keyword/sentence pair
+    keyword_embeddings = encode(jd_keywords)
+    sentence_embeddings = encode(resume_sentences)
+    similarity = cosine_matrix(keyword_embeddings, sentence_embeddings)
 
-def semantic_keyword_match(jd_keywords, resume_sentences, threshold=0.7):
-    matched, missing = [], []
-
-    for keyword in jd_keywords:
-        keyword_embedding = model.encode(keyword, convert_to_tensor=True)
-        found = False
+    best_idx = similarity.argmax(axis=1)
+    best_scores = similarity[np.arange(len(jd_keywords)), best_idx]
 
-        for sentence in resume_sentences:
-            sentence_embedding = model.encode(sentence, convert_to_tensor=True)
-            similarity = util.pytorch_cos_sim(keyword_embedding, sentence_embedding)
-            if similarity.item() >= threshold:
-                matched.append(keyword)
-                found = True
-                break
-
-        if not found:
-            missing.append(keyword)
+    return [
+        {
+            "keyword": keyword,
+            "matched": bool(score >= threshold),
+            "sentence": resume_sentences[idx],
+            "score": float(score),
+        }
+        for keyword, idx, score in zip(jd_keywords, best_idx, best_scores)
+    ]
 
+def semantic_keyword_match(jd_keywords, resume_sentences, threshold=0.7):
+    coverage = keyword_coverage(jd_keywords, resume_sentences, threshold)
+    matched = [c["keyword"] for c in coverage if c["matched"]]
+    missing = [c["keyword"] for c in coverage if not c["matched"]]
     return matched, missing
 
-def preprocess_text(text):
-    text = text.lower()
-    text = re.sub(r"\d+", "", text)
-    text = re.sub(r"[^\w\s]", "", text)
-    tokens = text.split()
-    tokens = [word for word in tokens if word not in stop_words]
-    return " ".join(tokens)
-
-def compute_similarity(resume_text, jd_text):
+def compute_similarity(resume_text, jd_text, jd_clean=None):
     resume_clean = preprocess_text(resume_text)
-    jd_clean = preprocess_text(jd_text)
+    if jd_clean is None:
+        jd_clean = preprocess_text(jd_text)
 
-    resume_embedding = model.encode(resume_clean, convert_to_tensor=True)
-    jd_embedding = model.encode(jd_clean, convert_to_tensor=True)
+    resume_embedding = encode(resume_clean)
+    jd_embedding = encode(jd_clean)
 
-    similarity_score = util.pytorch_cos_sim(resume_embedding, jd_embedding)[0][0].item()
+    similarity_score = float(cosine_matrix(resume_embedding, jd_embedding)[0][0])
     return round(similarity_score * 100, 2)
 
-def extract_missing_keywords(resume_text, jd_text, top_k=10):
+def extract_missing_keywords(resume_text, jd_text, top_k=10, return_scores=False, jd_clean=None,
+                             return_embeddings=False, resume_sentences=None):
+    """
+    JD words absent from the resume, most relevant to the resume first
+    Args:
+        resume_text (str): Raw resume text
+        jd_text (str): Raw job description
+        top_k (int): Number of keywords to return
+        return_scores (bool): Return (word, score) pairs
+        jd_clean (str): Precomputed preprocess_text(jd_text) (optional)
+        return_embeddings (bool): Also return the embeddings of the returned words
+        resume_sentences (list): Resume sentences (e.g. from parse_document); each word is
+                                 scored against its closest sentence instead of one
+                                 embedding of the whole (model-truncated) resume
+    """
+    if jd_clean is None:
+        jd_clean = preprocess_text(jd_text)
     resume_words = set(preprocess_text(resume_text).split())
-    jd_words = list(set(preprocess_text(jd_text).split()))
+    jd_words = list(set(jd_clean.split()))
+
+    candidates = [word for word in jd_words if word not in resume_words]
+    if not candidates or top_k <= 0:
+        return ([], np.zeros((0, 0), dtype=np.float32)) if return_embeddings else []
+
+    # Score each JD word based on its relevance with resume:
+    # the resume (or its sentences) is embedded once and all candidate words in one batch
+    resume_embeddings = encode(list(resume_sentences) if resume_sentences else [resume_text])
+    word_embeddings = encode(candidates)
+    scores = cosine_matrix(word_embeddings, resume_embeddings).max(axis=1)
 
-    # Score each JD word based on its relevance with resume
-    missing_scores = []
-    for word in jd_words:
-        if word not in resume_words:
-            word_embedding = model.encode(word, convert_to_tensor=True)
-            resume_embedding = model.encode(resume_text, convert_to_tensor=True)
-            score = util.pytorch_cos_sim(word_embedding, resume_embedding)[0][0].item()
-            missing_scores.append((word, score))
+    # Top-k by similarity (relevance) descending, without sorting every candidate
+    k = min(top_k, len(candidates))
+    top_idx = np.argpartition(-scores, k - 1)[:k]
+    top_idx = top_idx[np.argsort(-scores[top_idx], kind="stable")]
 
-    # Sort by similarity (relevance) descending
-    missing_scores.sort(key=lambda x: x[1], reverse=True)
-    top_missing = [word for word, _ in missing_scores[:top_k]]
-    return top_missing
+    if return_scores:
+        result = [(candidates[i], float(scores[i])) for i in top_idx]
+    else:
+        result = [candidates[i] for i in top_idx]
+    # The keyword embeddings can be reused downstream (e.g. bullet suggestions)
+    if return_embeddings:
+        return result, word_embeddings[top_idx]
+    return result
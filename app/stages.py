@@ -0,0 +1,47 @@
+# app/stages.py
+
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+
+def run_stages(stages, timeouts=None, default_timeout=None, max_workers=None):
+    """
+    Run independent analysis stages concurrently on a thread pool
+    Args:
+        stages (dict): Stage name -> zero-argument callable
+        timeouts (dict): Stage name -> seconds allowed, measured from the start of the run
+        default_timeout (float): Timeout for stages missing from `timeouts` (None = wait)
+        max_workers (int): Pool size (defaults to one thread per stage)
+    Returns:
+        tuple: (results, status) where results maps finished stages to their value and
+               status maps every stage to "ok", "timeout" or "error: <message>"
+    """
+    timeouts = timeouts or {}
+    results, status = {}, {}
+    if not stages:
+        return results, status
+
+    pool = ThreadPoolExecutor(max_workers=max_workers or len(stages), thread_name_prefix="stage")
+    start = time.perf_counter()
+    try:
+        futures = {name: pool.submit(fn) for name, fn in stages.items()}
+
+        # Collect in deadline order so a slow stage never delays reporting a fast one
+        def deadline(name):
+            limit = timeouts.get(name, default_timeout)
+            return float("inf") if limit is None else start + limit
+
+        for name in sorted(futures, key=deadline):
+            remaining = deadline(name) - time.perf_counter()
+            try:
+                results[name] = futures[name].result(timeout=None if remaining == float("inf") else max(0, remaining))
+                status[name] = "ok"
+            except FutureTimeout:
+                status[name] = "timeout"
+            except Exception as e:
+                status[name] = f"error: {str(e)}"
+    finally:
+        # Don't block on stragglers: their results are simply dropped
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return results, status
@@ -0,0 +1,170 @@
+# app/text_metrics.py
+#
+# Shared text normalization and single-pass lexical metrics (fillers,
+# type/token statistics, readability) used by the transcript, resume and
+# keyword modules.
+
+import re
+from functools import lru_cache
+
+# -----------------------------
+# Precompiled patterns
+# -----------------------------
+_DIGITS = re.compile(r"\d+")
+_NON_WORD = re.compile(r"[^\w\s]")
+_KEYWORD_PUNCT = re.compile(r"[^\w\s-]")
+_TRANSCRIPT_PUNCT = re.compile(r"[^\w\s.,;!?]")
+_WHITESPACE = re.compile(r"\s+")
+_WORD = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+_VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+
+# NLTK English stopword list (nltk.corpus.stopwords.words("english")), embedded so
+# no corpus has to be loaded
+STOP_WORDS = frozenset("""
+i me my myself we our ours ourselves you you're you've you'll you'd your yours
+yourself yourselves he him his himself she she's her hers herself it it's its
+itself they them their theirs themselves what which who whom this that that'll
+these those am is are was were be been being have has had having do does did
+doing a an the and but if or because as until while of at by for with about
+against between into through during before after above below to from up down in
+out on off over under again further then once here there when where why how all
+any both each few more most other some such no nor not only own same so than too
+very s t can will just don don't should should've now d ll m o re ve y ain aren
+aren't couldn couldn't didn didn't doesn doesn't hadn hadn't hasn hasn't haven
+haven't isn isn't ma mightn mightn't mustn mustn't needn needn't shan shan't
+shouldn shouldn't wasn wasn't weren weren't won won't wouldn wouldn't
+""".split())
+
+FILLERS = frozenset({"um", "uh", "like", "you know", "actually", "basically", "so", "literally"})
+
+
+# -----------------------------
+# Normalization
+# -----------------------------
+def clean_transcript(text):
+    """Drop everything except word characters, whitespace and sentence punctuation"""
+    return _TRANSCRIPT_PUNCT.sub("", text)
+
+def clean_keyword_text(text):
+    """Lowercase and remove punctuation except hyphens"""
+    return _WHITESPACE.sub(" ", _KEYWORD_PUNCT.sub(" ", text.lower())).strip()
+
+def preprocess_text(text):
+    """Lowercase, strip digits and punctuation, drop stopwords"""
+    text = _NON_WORD.sub("", _DIGITS.sub("", text.lower()))
+    return " ".join(word for word in text.split() if word not in STOP_WORDS)
+
+def tokenize_words(text):
+    """Lowercase word tokens (no punctuation tokens; contractions stay whole)"""
+    return _WORD.findall(text.lower())
+
+
+# -----------------------------
+# Multi-word filler matching
+# -----------------------------
+class PhraseTrie:
+    """Token-level trie; finds non-overlapping, longest-first phrase matches in one scan"""
+
+    _END = object()
+
+    def __init__(self, phrases):
+        self.root = {}
+        self.max_len = 0
+        for phrase in phrases:
+            words = phrase.lower().split()
+            node = self.root
+            for word in words:
+                node = node.setdefault(word, {})
+            node[self._END] = phrase
+            self.max_len = max(self.max_len, len(words))
+
+    def match_at(self, tokens, i):
+        """(phrase, length) of the longest phrase starting at tokens[i], or (None, 0)"""
+        node = self.root
+        found, length = None, 0
+        for j in range(i, min(i + self.max_len, len(tokens))):
+            node = node.get(tokens[j])
+            if node is None:
+                break
+            if self._END in node:
+                found, length = node[self._END], j - i + 1
+        return found, length
+
+_filler_trie = PhraseTrie(FILLERS)
+
+
+# -----------------------------
+# Readability
+# -----------------------------
+_pyphen = None
+
+@lru_cache(maxsize=20000)
+def syllable_count(word):
+    """
+    Syllables in one word, with the hyphenation dictionary textstat falls back on
+    (textstat itself would try to download cmudict at runtime)
+    """
+    global _pyphen
+    if _pyphen is None:
+        try:
+            import pyphen
+            _pyphen = pyphen.Pyphen(lang="en_US")
+        except ImportError:
+            _pyphen = False
+    if _pyphen:
+        return len(_pyphen.positions(word)) + 1
+    return max(1, len(_VOWEL_GROUPS.findall(word)))
+
+
+# -----------------------------
+# Single-pass lexical metrics
+# -----------------------------
+def lexical_metrics(tokens, sentence_count=1, filler_trie=None):
+    """
+    Filler, vocabulary and readability metrics from one scan over the tokens
+    Args:
+        tokens (list): Lowercase word tokens (see tokenize_words)
+        sentence_count (int): Number of sentences, for the readability formulas
+        filler_trie (PhraseTrie): Filler phrases to count (defaults to FILLERS)
+    Returns:
+        dict: word_count, filler_count, filler_breakdown, unique_words,
+              type_token_ratio, vocabulary_score, flesch_reading_ease, flesch_kincaid_grade
+    """
+    trie = filler_trie or _filler_trie
+    fillers = {}
+    types = set()
+    content_types = set()
+    content_chars = 0
+    syllables = 0
+
+    n = len(tokens)
+    skip_until = 0  # inside a multi-word filler already counted
+    for i, token in enumerate(tokens):
+        types.add(token)
+        syllables += syllable_count(token)
+        if token not in STOP_WORDS and token.isalpha() and token not in content_types:
+            content_types.add(token)
+            content_chars += len(token)
+        if i >= skip_until and token in trie.root:
+            phrase, length = trie.match_at(tokens, i)
+            if phrase:
+                fillers[phrase] = fillers.get(phrase, 0) + 1
+                skip_until = i + length
+
+    metrics = {
+        "word_count": n,
+        "filler_count": sum(fillers.values()),
+        "filler_breakdown": fillers,
+        "unique_words": len(types),
+        "type_token_ratio": round(len(types) / n, 3) if n else 0.0,
+        "vocabulary_score": round(content_chars / len(content_types), 2) if content_types else 0.0,
+        "flesch_reading_ease": 0.0,
+        "flesch_kincaid_grade": 0.0,
+    }
+    if n:
+        # Same formulas and constants as textstat.flesch_reading_ease / flesch_kincaid_grade
+        words_per_sentence = n / max(sentence_count, 1)
+        syllables_per_word = syllables / n
+        metrics["flesch_reading_ease"] = round(206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word, 2)
+        metrics["flesch_kincaid_grade"] = round(0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59, 2)
+    return metrics
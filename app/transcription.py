@@ -0,0 +1,156 @@
+# app/transcription.py
+
+import threading
+
+import numpy as np
+
+from app import config
+from app.audio_decode import TARGET_RATE as SAMPLE_RATE
+from app.vad import vad_chunks
+
+_whisper_model = None
+_whisper_lock = threading.Lock()
+
+
+def get_whisper_model():
+    """Resident Whisper model, loaded once per process (size from config)"""
+    global _whisper_model
+    if _whisper_model is None:
+        with _whisper_lock:
+            if _whisper_model is None:
+                import whisper
+                _whisper_model = whisper.load_model(config.WHISPER_MODEL, device=config.WHISPER_DEVICE)
+    return _whisper_model
+
+
+# -----------------------------
+# Backends
+# -----------------------------
+def _whisper_transcribe(samples, prompt=None):
+    """Transcribe one chunk; returns Whisper segments with chunk-relative times"""
+    result = get_whisper_model().transcribe(
+        samples,
+        fp16=False,
+        language=config.WHISPER_LANGUAGE,
+        condition_on_previous_text=False,
+        initial_prompt=prompt,
+    )
+    return [
+        {"start": seg["start"], "end": seg["end"], "text": seg["text"].strip()}
+        for seg in result.get("segments", [])
+        if seg["text"].strip()
+    ]
+
+
+def _google_transcribe(samples, prompt=None):
+    """Optional network backend (speech_recognition's Google Web Speech API)"""
+    import speech_recognition as sr
+
+    pcm = (np.clip(samples, -1, 1) * 32767).astype(np.int16).tobytes()
+    try:
+        text = sr.Recognizer().recognize_google(sr.AudioData(pcm, SAMPLE_RATE, 2))
+    except sr.UnknownValueError:
+        return _whisper_transcribe(samples, prompt)
+    except sr.RequestError as e:
+        raise ConnectionError(str(e)) from e
+    return [{"start": 0.0, "end": len(samples) / SAMPLE_RATE, "text": text}] if text else []
+
+
+BACKENDS = {
+    "whisper": _whisper_transcribe,
+    "google": _google_transcribe,
+}
+
+
+# -----------------------------
+# Chunked / streaming transcription
+# -----------------------------
+def transcribe_stream(samples, backend=None, max_chunk_s=None):
+    """
+    Transcribe 16 kHz float32 audio chunk by chunk, cutting at silences
+    Yields:
+        dict: {"start", "end", "text"} with absolute times in seconds
+    """
+    transcribe_chunk = BACKENDS[backend or config.TRANSCRIBE_BACKEND]
+    prompt = None
+    for start, end in vad_chunks(samples, SAMPLE_RATE, max_chunk_s or config.TRANSCRIBE_CHUNK_SECONDS):
+        offset = start / SAMPLE_RATE
+        for seg in transcribe_chunk(samples[start:end], prompt):
+            yield {"start": round(offset + float(seg["start"]), 2), "end": round(offset + float(seg["end"]), 2),
+                   "text": seg["text"]}
+            prompt = seg["text"]  # previous text keeps terminology consistent across chunks
+
+
+class StreamingTranscriber:
+    """
+    Incremental transcription for audio that arrives in pieces (e.g. a live
+    recording). feed() buffers samples and transcribes every chunk that has
+    been closed by a pause (or has reached max_chunk_s); finish() flushes the rest.
+    """
+
+    def __init__(self, backend=None, max_chunk_s=None, min_pause_s=0.6):
+        self.transcribe_chunk = BACKENDS[backend or config.TRANSCRIBE_BACKEND]
+        self.max_chunk_s = max_chunk_s or config.TRANSCRIBE_CHUNK_SECONDS
+        self.min_pause_s = min_pause_s
+        self.segments = []
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._offset = 0.0
+        self._prompt = None
+
+    @property
+    def text(self):
+        return " ".join(seg["text"] for seg in self.segments)
+
+    def _emit(self, samples):
+        new = []
+        for seg in self.transcribe_chunk(samples, self._prompt):
+            seg = {"start": round(self._offset + float(seg["start"]), 2),
+                   "end": round(self._offset + float(seg["end"]), 2),
+                   "text": seg["text"]}
+            new.append(seg)
+            self._prompt = seg["text"]
+        self.segments.extend(new)
+        return new
+
+    def feed(self, samples):
+        """Add audio; returns the segments finalized by this call"""
+        self._buffer = np.concatenate([self._buffer, np.asarray(samples, dtype=np.float32).ravel()])
+        chunks = vad_chunks(self._buffer, SAMPLE_RATE, self.max_chunk_s)
+        if not chunks:
+            # Pure silence: keep only a short tail so the buffer stays bounded
+            keep = int(self.min_pause_s * SAMPLE_RATE)
+            self._offset += max(0, len(self._buffer) - keep) / SAMPLE_RATE
+            self._buffer = self._buffer[-keep:] if keep else self._buffer[:0]
+            return []
+
+        # A chunk is final once enough silence follows it, or it hit the length cap
+        min_pause = int(self.min_pause_s * SAMPLE_RATE)
+        max_len = int(self.max_chunk_s * SAMPLE_RATE)
+        closed_until = 0
+        for start, end in chunks:
+            if len(self._buffer) - end >= min_pause or end - start >= max_len:
+                closed_until = end
+        if not closed_until:
+            return []
+
+        new = []
+        base = self._offset
+        for start, end in chunks:
+            if end > closed_until:
+                break
+            self._offset = base + start / SAMPLE_RATE
+            new.extend(self._emit(self._buffer[start:end]))
+        self._offset = base + closed_until / SAMPLE_RATE
+        self._buffer = self._buffer[closed_until:]
+        return new
+
+    def finish(self):
+        """Transcribe whatever is still buffered; returns the final segments"""
+        new = []
+        base = self._offset
+        for start, end in vad_chunks(self._buffer, SAMPLE_RATE, self.max_chunk_s):
+            self._offset = base + start / SAMPLE_RATE
+            new.extend(self._emit(self._buffer[start:end]))
+        self._offset = base + len(self._buffer) / SAMPLE_RATE
+        self._buffer = self._buffer[:0]
+        return new
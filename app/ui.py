@@ -1,11 +1,42 @@
 import streamlit as st
+from app import config
 from app.nlp_pipeline import analyze_transcript
-from app.keyword_extractor import extract_keywords, keyword_match
+from app.grammar import highlight_html
+from app.acoustics import acoustic_metrics
+from app.keyword_extractor import keyword_match
+from app.jd_analysis import analyze_jd
+from app.stages import run_stages
 from app.feedback_generator import generate_feedback
 from app.audio_input import transcribe_audio
-from app.record_audio import record_audio
+from app.record_audio import StreamingRecorder, LiveTranscription
+from app.document_reader import parse_document
+from app.bullet_suggester import suggest_resume_bullets
 from app.resume_matcher import compute_similarity as resume_similarity, extract_missing_keywords
-from app.contextual_eval import generate_ideal_answers, compute_similarity as contextual_similarity, visualize_alignment
+from app.llm_backends import backend_stats
+from app.contextual_eval import stream_ideal_answer, compute_similarity as contextual_similarity, visualize_alignment
+
+def _show_live_transcript(live):
+    """Partial transcript of an ongoing recording (re-rendered every second on its own)"""
+    state = "🔴 Recording" if live.recorder.is_recording else "⏸️ Maximum length reached, press Stop"
+    st.caption(f"{state} · {live.recorder.elapsed:.0f}s")
+    st.write(live.text or "_Listening..._")
+
+if hasattr(st, "fragment"):
+    _show_live_transcript = st.fragment(run_every=1)(_show_live_transcript)
+
+def _show_grammar_issues(details):
+    """Transcript sentences with their grammar issues underlined (hover for the message)"""
+    if not details:
+        st.write("No grammar issues found.")
+        return
+    by_sentence = {}
+    for issue in details:
+        by_sentence.setdefault(issue["sentence_index"], (issue["sentence"], []))[1].append(issue)
+    for sentence, issues in by_sentence.values():
+        st.markdown(highlight_html(sentence, issues), unsafe_allow_html=True)
+        for issue in issues:
+            fix = f" → _{issue['replacements'][0]}_" if issue["replacements"] else ""
+            st.caption(f"{issue['message']}{fix}")
 
 def launch_app():
     st.set_page_config(page_title="SpeakWise", layout="centered")
@@ -15,8 +46,13 @@ def launch_app():
     for key, val in {
         'jd_text': None,
         'resume_text': None,
+        'resume_doc': None,
         'recording_status': 'idle',
-        'audio_duration': 60
+        'audio_duration': 60,
+        'audio_upload_id': None,
+        'audio_upload_result': None,
+        'live_session': None,
+        'recorded_result': None
     }.items():
         st.session_state.setdefault(key, val)
 
@@ -37,12 +73,9 @@ def launch_app():
         uploaded_resume = st.file_uploader("Upload Resume (TXT/PDF)", type=["txt", "pdf"], key="resume_upload")
         if uploaded_resume:
             try:
-                if uploaded_resume.type == "application/pdf":
-                    import fitz
-                    with fitz.open(stream=uploaded_resume.read(), filetype="pdf") as doc:
-                        st.session_state.resume_text = "\n".join([page.get_text() for page in doc])
-                else:
-                    st.session_state.resume_text = uploaded_resume.read().decode("utf-8")
+                # Parsed once per file content; reruns with the same upload hit the cache
+                st.session_state.resume_doc = parse_document(uploaded_resume.getvalue(), uploaded_resume.name)
+                st.session_state.resume_text = st.session_state.resume_doc["text"]
                 st.success("✅ Resume uploaded!")
             except Exception as e:
                 st.error(f"❌ Error reading file: {e}")
@@ -51,8 +84,16 @@ def launch_app():
             st.subheader("🔍 Analysis Report")
             with st.spinner("Analyzing resume..."):
                 try:
-                    similarity = resume_similarity(st.session_state.resume_text, st.session_state.jd_text)
-                    missing_keywords = extract_missing_keywords(st.session_state.resume_text, st.session_state.jd_text)
+                    jd = analyze_jd(st.session_state.jd_text, with_keywords=False)
+                    similarity = resume_similarity(
+                        st.session_state.resume_text, st.session_state.jd_text, jd_clean=jd["match_text"]
+                    )
+                    doc = st.session_state.resume_doc
+                    missing_keywords, missing_embeddings = extract_missing_keywords(
+                        st.session_state.resume_text, st.session_state.jd_text,
+                        return_scores=True, jd_clean=jd["match_text"], return_embeddings=True,
+                        resume_sentences=[s["text"] for s in doc["sentences"]] if doc else None
+                    )
 
                     col1, col2 = st.columns(2)
                     col1.metric("JD Match Score", f"{similarity:.1f}%")
@@ -60,7 +101,21 @@ def launch_app():
 
                     with st.expander("🔍 View Missing Keywords"):
                         st.write("These keywords from the JD are missing/mismatched in your resume:")
-                        st.write(missing_keywords)
+                        st.table([
+                            {"Keyword": word, "Relevance": f"{score:.2f}"}
+                            for word, score in missing_keywords
+                        ])
+
+                    if doc and missing_keywords:
+                        # Bullet points are the lines worth extending; plain-text resumes offer every line
+                        lines = [line["text"] for line in doc["lines"] if line["bullet"]] or \
+                                [line["text"] for line in doc["lines"]]
+                        suggestions = suggest_resume_bullets(
+                            lines, [word for word, _ in missing_keywords], keyword_embeddings=missing_embeddings
+                        )
+                        with st.expander("✍️ Bullet Suggestions"):
+                            for keyword, line, _ in suggestions:
+                                st.markdown(f"**{keyword}** → {line}")
 
                 except Exception as e:
                     st.error(f"❌ Analysis failed: {e}")
@@ -77,6 +132,7 @@ def launch_app():
 
         st.subheader("🎤 Input Options")
         transcript = ""
+        audio_data = None
 
         col_upload, col_record = st.columns(2)
 
@@ -84,9 +140,14 @@ def launch_app():
             uploaded_audio = st.file_uploader("Upload Audio (.wav)", type=["wav"], key="audio_upload")
             if uploaded_audio:
                 try:
-                    with open("temp_audio.wav", "wb") as f:
-                        f.write(uploaded_audio.read())
-                    audio_data = transcribe_audio("temp_audio.wav")
+                    # Decoded straight from the upload buffer (no shared temp file), and
+                    # only once per upload rather than on every rerun
+                    if st.session_state.audio_upload_id != uploaded_audio.file_id:
+                        st.session_state.audio_upload_result = transcribe_audio(uploaded_audio.getbuffer(), keep_audio=True)
+                        st.session_state.audio_upload_id = uploaded_audio.file_id
+                    audio_data = st.session_state.audio_upload_result
+                    if audio_data['error']:
+                        raise RuntimeError(audio_data['error'])
                     transcript = audio_data['text']
                     st.session_state.audio_duration = audio_data['duration']
                     st.success("✅ Audio processed")
@@ -94,20 +155,39 @@ def launch_app():
                     st.error(f"❌ Audio processing failed: {e}")
 
         with col_record:
-            duration = st.slider("Recording duration (seconds)", 10, 120, 30, key="rec_duration")
-            if st.button("🎤 Start Recording", key="rec_button"):
-                try:
-                    st.session_state.recording_status = "recording"
-                    with st.spinner(f"Recording for {duration} seconds..."):
-                        audio_path = record_audio(duration)
-                        audio_data = transcribe_audio(audio_path)
-                        transcript = audio_data['text']
-                        st.session_state.audio_duration = audio_data['duration']
-                        st.session_state.recording_status = "complete"
-                        st.success("✅ Recording complete")
-                except Exception as e:
-                    st.error(f"❌ Recording failed: {e}")
-                    st.session_state.recording_status = "error"
+            max_duration = st.slider("Maximum recording length (seconds)", 10, 120, 30, key="rec_duration")
+            live = st.session_state.live_session
+            if live is None:
+                if st.button("🎤 Start Recording", key="rec_button"):
+                    try:
+                        # Capture runs on the audio callback thread and transcription on a
+                        # background thread, so this script run returns immediately
+                        recorder = StreamingRecorder(max_seconds=max_duration)
+                        st.session_state.live_session = LiveTranscription(recorder).start()
+                        st.session_state.recorded_result = None
+                        st.session_state.recording_status = "recording"
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"❌ Recording failed: {e}")
+                        st.session_state.recording_status = "error"
+            elif st.button("⏹️ Stop Recording", key="rec_stop_button"):
+                with st.spinner("Finishing transcription..."):
+                    st.session_state.recorded_result = live.stop()
+                st.session_state.live_session = None
+                st.session_state.recording_status = "complete"
+                st.rerun()
+            else:
+                _show_live_transcript(live)
+
+            recorded = st.session_state.recorded_result
+            if recorded:
+                if recorded['error']:
+                    st.error(f"❌ Recording failed: {recorded['error']}")
+                else:
+                    audio_data = recorded
+                    transcript = audio_data['text']
+                    st.session_state.audio_duration = audio_data['duration']
+                    st.success("✅ Recording complete")
 
         if not (uploaded_audio or transcript):
             st.session_state.audio_duration = st.number_input(
@@ -126,9 +206,31 @@ def launch_app():
             st.subheader("📊 Analysis Results")
             with st.spinner("Analyzing your response..."):
                 try:
-                    metrics = analyze_transcript(user_input, st.session_state.audio_duration)
-                    keywords = extract_keywords(st.session_state.jd_text)
-                    matched = keyword_match(keywords, user_input)
+                    jd_text = st.session_state.jd_text
+                    audio_duration = st.session_state.audio_duration
+                    # Speaking time / pauses straight from the decoded signal when the answer came from audio
+                    acoustics = None
+                    if audio_data and audio_data.get("audio"):
+                        audio = audio_data["audio"]
+                        acoustics = acoustic_metrics(audio["samples"], audio["sample_rate"])
+
+                    def keyword_stage():
+                        # JD keywords/embeddings are memoized by content hash across reruns and sessions
+                        jd = analyze_jd(jd_text)
+                        matched = keyword_match(jd["keywords"], user_input, keyword_embeddings=jd["keyword_embeddings"])
+                        return jd["keywords"], matched
+
+                    # Transcript metrics and keyword coverage don't depend on each other
+                    results, status = run_stages({
+                        "transcript": lambda: analyze_transcript(user_input, audio_duration, acoustics=acoustics),
+                        "keywords": keyword_stage,
+                    })
+                    if status["transcript"] != "ok":
+                        raise RuntimeError(f"transcript analysis {status['transcript']}")
+                    metrics = results["transcript"]
+                    keywords, matched = results.get("keywords", ([], []))
+                    if metrics["incomplete_stages"] or status["keywords"] != "ok":
+                        st.warning("Some checks did not finish in time or are unavailable; showing partial results.")
                     feedback = generate_feedback(metrics, matched, len(keywords))
 
                     metric_data = [
@@ -136,7 +238,9 @@ def launch_app():
                         ("Keyword Coverage", f"{len(matched)}/{len(keywords)}", True),
                         ("Speech Pace", f"{metrics['speech_pace_wpm']} WPM", True),
                         ("Filler Words", metrics['filler_count'], True),
-                        ("Grammar Issues", metrics['grammar_issues'], True)
+                        ("Grammar Issues", metrics['grammar_issues'], metrics['grammar_issues'] is not None),
+                        ("Speaking Time", f"{metrics.get('speaking_time', 0):.0f}s", 'speaking_time' in metrics),
+                        ("Pauses", metrics.get('pause_count', 0), 'pause_count' in metrics)
                     ]
 
                     valid_metrics = [md for md in metric_data if md[2]]
@@ -144,7 +248,7 @@ def launch_app():
                     for i, (label, value, _) in enumerate(valid_metrics):
                         metric_cols[i].metric(label, value)
 
-                    tab_fb, tab_kw = st.tabs(["💡 Feedback", "🔑 Keywords"])
+                    tab_fb, tab_kw, tab_gr = st.tabs(["💡 Feedback", "🔑 Keywords", "✍️ Grammar"])
                     with tab_fb:
                         st.subheader("Improvement Suggestions")
                         for s in feedback:
@@ -160,6 +264,13 @@ def launch_app():
                             st.subheader("Missing Keywords")
                             st.write(missing or "All keywords covered!")
 
+                    with tab_gr:
+                        # Issue details come from the analysis itself, no second grammar pass
+                        if metrics["grammar_issues"] is None:
+                            st.write("Grammar check unavailable for this answer.")
+                        else:
+                            _show_grammar_issues(metrics["grammar_details"])
+
                 except Exception as e:
                     st.error(f"❌ Analysis failed: {e}")
 
@@ -172,14 +283,25 @@ def launch_app():
 
         if st.button("🧠 Evaluate with LLaMA"):
             if jd_text and user_answer:
-                with st.spinner("Generating ideal answer using LLaMA-2..."):
-                    ideal_answer = generate_ideal_answers(jd_text)
-                    st.success("✅ Ideal answer generated.")
+                st.markdown("### ✅ Ideal Answer")
+                # Tokens are rendered as they arrive; repeat JDs come straight from the cache
+                try:
+                    ideal_answer = st.write_stream(stream_ideal_answer(jd_text, raise_errors=True))
+                except Exception as e:
+                    # Shown apart from the partial answer, which is not compared
+                    st.error(f"❌ Ideal answer generation failed: {e}")
+                    st.stop()
+                st.success("✅ Ideal answer generated.")
+                stats = backend_stats().get(config.LLM_BACKEND)
+                if stats and stats["calls"]:
+                    st.caption(f"⚙️ {config.LLM_BACKEND}: {stats['avg_latency_s']}s avg latency, "
+                               f"{stats['avg_first_token_s']}s to first token, {stats['tokens_per_s']} tokens/s")
 
-                    st.markdown("### ✅ Ideal Answer")
-                    st.write(ideal_answer)
+                with st.spinner("Comparing your answer..."):
 
-                    matched, missing, scores = contextual_similarity(user_answer, ideal_answer)
+                    matched, missing, scores, alignment = contextual_similarity(
+                        user_answer, ideal_answer, return_alignment=True
+                    )
 
                     st.markdown(f"🔍 **Matched Sentences:** {len(matched)}")
                     st.markdown(f"❌ **Missing Sentences:** {len(missing)}")
@@ -194,7 +316,7 @@ def launch_app():
                         for s, score in missing:
                             st.markdown(f"<span style='color:red'>✘ {s} ({score:.2f})</span>", unsafe_allow_html=True)
 
-                    visualize_alignment(ideal_answer, scores)
+                    visualize_alignment(ideal_answer, scores, ideal_sentences=alignment["ideal_sentences"])
             else:
                 st.warning("Please provide both JD and your answer.")
 
@@ -0,0 +1,99 @@
+# app/vad.py
+
+import numpy as np
+
+
+# -----------------------------
+# Framing
+# -----------------------------
+def frame_signal(samples, frame_len, hop):
+    """Strided (no-copy) view of `samples` as overlapping frames, shape (n_frames, frame_len)"""
+    samples = np.asarray(samples, dtype=np.float32)
+    if len(samples) < frame_len:
+        samples = np.pad(samples, (0, frame_len - len(samples)))
+    return np.lib.stride_tricks.sliding_window_view(samples, frame_len)[::hop]
+
+
+def frame_energy_db(samples, sample_rate, frame_ms=30, hop_ms=10):
+    """RMS energy per frame in dBFS"""
+    frame_len = int(sample_rate * frame_ms / 1000)
+    hop = int(sample_rate * hop_ms / 1000)
+    frames = frame_signal(samples, frame_len, hop)
+    rms = np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame_len)
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+# -----------------------------
+# Energy-based voice activity detection
+# -----------------------------
+def speech_mask(energy_db, margin_db=12.0, floor_db=-50.0):
+    """
+    Frames louder than the noise floor by `margin_db` (and above an absolute floor).
+    The noise floor is the 10th percentile of frame energies; the threshold is
+    capped below the peak so audio without any pause is still detected as speech.
+    """
+    if len(energy_db) == 0:
+        return np.zeros(0, dtype=bool)
+    noise_floor = np.percentile(energy_db, 10)
+    threshold = min(noise_floor + margin_db, energy_db.max() - margin_db / 2)
+    return energy_db > max(threshold, floor_db)
+
+
+def mask_runs(mask):
+    """(start, end) frame index pairs of consecutive True values"""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(np.diff(padded.astype(np.int8)))
+    return edges.reshape(-1, 2)
+
+
+def speech_segments(samples, sample_rate, frame_ms=30, hop_ms=10,
+                    min_silence_ms=300, min_speech_ms=120, pad_ms=100):
+    """
+    Speech regions as (start_sample, end_sample) pairs.
+    Gaps shorter than min_silence_ms are bridged, blips shorter than
+    min_speech_ms are dropped and each region is padded by pad_ms.
+    """
+    energy_db = frame_energy_db(samples, sample_rate, frame_ms, hop_ms)
+    mask = speech_mask(energy_db)
+    runs = mask_runs(mask)
+    if len(runs) == 0:
+        return []
+
+    hop = int(sample_rate * hop_ms / 1000)
+    frame_len = int(sample_rate * frame_ms / 1000)
+    min_gap = int(min_silence_ms / hop_ms)
+    min_len = int(min_speech_ms / hop_ms)
+
+    # Bridge short gaps between runs
+    merged = [list(runs[0])]
+    for start, end in runs[1:]:
+        if start - merged[-1][1] < min_gap:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end])
+
+    pad = int(sample_rate * pad_ms / 1000)
+    total = len(samples)
+    return [
+        (int(max(0, start * hop - pad)), int(min(total, (end - 1) * hop + frame_len + pad)))
+        for start, end in merged
+        if end - start >= min_len
+    ]
+
+
+def vad_chunks(samples, sample_rate, max_chunk_s=30.0, **segment_options):
+    """
+    Group speech segments into chunks no longer than max_chunk_s, cut at silences.
+    A single segment longer than the limit is split at fixed max_chunk_s boundaries.
+    """
+    max_len = int(max_chunk_s * sample_rate)
+    chunks = []
+    for start, end in speech_segments(samples, sample_rate, **segment_options):
+        while end - start > max_len:
+            chunks.append((start, start + max_len))
+            start += max_len
+        if chunks and end - chunks[-1][0] <= max_len and start - chunks[-1][1] < sample_rate:
+            chunks[-1] = (chunks[-1][0], end)  # close neighbours share a chunk
+        else:
+            chunks.append((start, end))
+    return chunks
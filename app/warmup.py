@@ -0,0 +1,122 @@
+# app/warmup.py
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import config
+
+_DUMMY_TEXT = "I built a machine learning model in Python. It improved accuracy by ten percent."
+
+_done = False
+_done_lock = threading.Lock()
+_background = None
+
+
+# -----------------------------
+# Component loaders: load + one dummy inference each
+# -----------------------------
+def _warm_embeddings():
+    from app.embeddings import encode
+    encode([_DUMMY_TEXT], use_cache=False)
+
+def _warm_keybert():
+    from app.keyword_extractor import get_kw_model
+    get_kw_model().extract_keywords(_DUMMY_TEXT, top_n=1)
+
+def _warm_sentiment():
+    from app.nlp_pipeline import get_sentiment_analyzer
+    analyzer = get_sentiment_analyzer()
+    if analyzer is None:
+        raise RuntimeError("sentiment analyzer unavailable")
+    analyzer(_DUMMY_TEXT)
+
+def _warm_grammar():
+    from app.grammar import check_sentences, get_grammar_tool
+    if get_grammar_tool() is None:
+        raise RuntimeError("grammar checker unavailable")
+    check_sentences([_DUMMY_TEXT])
+
+def _warm_whisper():
+    import numpy as np
+    from app.transcription import get_whisper_model
+    get_whisper_model().transcribe(np.zeros(16000, dtype=np.float32), fp16=False)
+
+COMPONENTS = {
+    "embeddings": _warm_embeddings,
+    "keybert": _warm_keybert,
+    "sentiment": _warm_sentiment,
+    "grammar": _warm_grammar,
+    "whisper": _warm_whisper,
+}
+
+
+def _run_component(name):
+    start = time.perf_counter()
+    try:
+        COMPONENTS[name]()
+        return {"seconds": round(time.perf_counter() - start, 3), "ok": True, "error": None}
+    except Exception as e:
+        return {"seconds": round(time.perf_counter() - start, 3), "ok": False, "error": str(e)}
+
+
+def warmup(components=None, max_workers=None):
+    """
+    Load models in parallel threads and prime each with one dummy inference
+    Args:
+        components (list): Names from COMPONENTS (defaults to config.WARMUP_COMPONENTS)
+        max_workers (int): Thread count (defaults to one per component)
+    Returns:
+        dict: Per-component {"seconds", "ok", "error"}
+    """
+    names = list(components or config.WARMUP_COMPONENTS)
+    unknown = [n for n in names if n not in COMPONENTS]
+    if unknown:
+        raise ValueError(f"Unknown warmup component(s): {', '.join(unknown)}")
+    if not names:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(names), thread_name_prefix="warmup") as pool:
+        futures = {name: pool.submit(_run_component, name) for name in names}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def warmup_once(components=None):
+    """Run warmup() the first time it is called in this process (Streamlit reruns main.py)"""
+    global _done
+    with _done_lock:
+        if _done:
+            return None
+        _done = True
+    return warmup(components)
+
+
+def warmup_in_background(components=None):
+    """
+    Start warmup_once() in a daemon thread and return immediately, so no session
+    waits for it; sessions that need a model first just wait on that model's loader.
+    Only the first call in the process starts a thread (Streamlit reruns main.py).
+    Returns:
+        threading.Thread: The warm-up thread, or None if warm-up already started
+    """
+    global _background
+    with _done_lock:
+        if _done or _background is not None:
+            return None
+        _background = threading.Thread(
+            target=_warmup_and_report, args=(components,), name="warmup", daemon=True
+        )
+        _background.start()
+    return _background
+
+
+def _warmup_and_report(components):
+    report = warmup_once(components)
+    if report is not None:
+        print_report(report)
+
+
+def print_report(report):
+    for name, r in report.items():
+        status = "✅" if r["ok"] else f"❌ {r['error']}"
+        print(f"{name:<12} {r['seconds']:>8.2f}s  {status}")
@@ -0,0 +1,187 @@
+# batch_eval.py
+#
+# Headless batch scoring of interview recordings against one JD.
+#
+#   python batch_eval.py recordings/ --jd sample_jd.txt --out results.jsonl --workers 4
+#
+# Every WAV in the directory is transcribed and scored in a process pool
+# (each worker loads the models it needs once; all workers share one
+# LanguageTool server). Results are appended to the JSONL file as they
+# complete, so rerunning the same command resumes where it stopped.
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from app import config
+
+_jd_text = None
+
+# What score_recording uses (KeyBERT loads lazily on the first analyze_jd call)
+WORKER_COMPONENTS = ("whisper", "embeddings", "sentiment", "grammar")
+
+
+# -----------------------------
+# Worker side
+# -----------------------------
+def _init_worker(jd_text, threads_per_worker, warm, grammar_url):
+    global _jd_text
+    _jd_text = jd_text
+
+    # Talk to the driver's LanguageTool server instead of starting a JVM per worker
+    if grammar_url:
+        config.GRAMMAR_SERVER_URL = grammar_url
+
+    # Split the cores between workers instead of every worker using all of them
+    config.EMBEDDING_THREADS = threads_per_worker
+    try:
+        import torch
+        torch.set_num_threads(threads_per_worker)
+    except ImportError:
+        pass
+
+    components = [c for c in config.WARMUP_COMPONENTS if c in WORKER_COMPONENTS]
+    if warm and components:
+        from app.warmup import warmup
+        warmup(components)
+
+
+def score_recording(path):
+    """Transcribe and score one recording; returns one JSON-serializable record"""
+    from app.acoustics import acoustic_metrics
+    from app.audio_input import transcribe_audio
+    from app.feedback_generator import generate_feedback
+    from app.jd_analysis import analyze_jd
+    from app.keyword_extractor import keyword_match
+    from app.nlp_pipeline import analyze_transcript
+
+    start = time.perf_counter()
+    record = {"file": os.path.basename(path), "error": None}
+    try:
+        audio = transcribe_audio(path, keep_audio=True)
+        if audio["error"]:
+            raise RuntimeError(audio["error"])
+        signal = audio.pop("audio")
+
+        # Errors are raised, not defaulted, so a failed analysis is recorded as an
+        # error (and retried) instead of being stored as a score of zero
+        jd = analyze_jd(_jd_text, raise_errors=True)
+        acoustics = acoustic_metrics(signal["samples"], signal["sample_rate"])
+        # No stage timeouts: headless scores must not depend on machine load
+        metrics = analyze_transcript(
+            audio["text"], audio["duration"] or 60, timeouts={}, acoustics=acoustics, raise_errors=True
+        )
+        matched = keyword_match(
+            jd["keywords"], audio["text"], keyword_embeddings=jd["keyword_embeddings"], raise_errors=True
+        )
+
+        record.update(
+            duration=round(audio["duration"], 2),
+            transcript=audio["text"],
+            metrics=metrics,
+            keywords=jd["keywords"],
+            matched_keywords=matched,
+            feedback=generate_feedback(metrics, matched, len(jd["keywords"])),
+        )
+    except Exception as e:
+        record["error"] = str(e)
+    record["seconds"] = round(time.perf_counter() - start, 2)
+    return record
+
+
+# -----------------------------
+# Driver
+# -----------------------------
+def completed_files(out_path, include_failed=True):
+    """Files already recorded in the output JSONL (a torn last line is ignored)"""
+    done = set()
+    if not os.path.exists(out_path):
+        return done
+    with open(out_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if "file" in record and (include_failed or not record.get("error")):
+                done.add(record["file"])
+    return done
+
+
+def _open_output(out_path):
+    # Make sure a line torn by an earlier crash doesn't swallow the next record
+    torn = False
+    if os.path.exists(out_path) and os.path.getsize(out_path) > 0:
+        with open(out_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            torn = f.read(1) != b"\n"
+    out = open(out_path, "a", encoding="utf-8")
+    if torn:
+        out.write("\n")
+    return out
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-score interview recordings against a job description")
+    parser.add_argument("audio_dir", help="directory containing .wav recordings")
+    parser.add_argument("--jd", required=True, help="job description text file")
+    parser.add_argument("--out", default="results.jsonl", help="JSONL output (appended to, resumable)")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--retry-failed", action="store_true", help="re-score files whose earlier record has an error")
+    parser.add_argument("--no-warmup", action="store_true", help="load models lazily in each worker")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    with open(args.jd, "r", encoding="utf-8") as f:
+        jd_text = f.read()
+
+    files = sorted(
+        os.path.join(args.audio_dir, name)
+        for name in os.listdir(args.audio_dir)
+        if name.lower().endswith(".wav")
+    )
+    done = completed_files(args.out, include_failed=not args.retry_failed)
+    todo = [p for p in files if os.path.basename(p) not in done]
+    print(f"🎧 {len(files)} recordings, {len(files) - len(todo)} already scored, {len(todo)} to go", file=sys.stderr)
+    if not todo:
+        return 0
+
+    workers = max(1, min(args.workers, len(todo)))
+    threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+    failures = 0
+
+    # One LanguageTool server for the whole run (started here unless one is configured)
+    grammar_url = config.GRAMMAR_SERVER_URL
+    if not grammar_url and workers > 1:
+        from app.grammar import grammar_server_url
+        grammar_url = grammar_server_url()
+        if grammar_url is None:
+            print("⚠️ Could not start a shared LanguageTool server; each worker starts its own", file=sys.stderr)
+
+    with _open_output(args.out) as out, ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(jd_text, threads_per_worker, not args.no_warmup, grammar_url),
+    ) as pool:
+        futures = {pool.submit(score_recording, path): path for path in todo}
+        for i, future in enumerate(as_completed(futures), 1):
+            record = future.result()
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            failures += record["error"] is not None
+            status = "❌ " + record["error"] if record["error"] else "✅"
+            print(f"[{i}/{len(todo)}] {record['file']} {record['seconds']}s {status}", file=sys.stderr)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
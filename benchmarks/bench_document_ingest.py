@@ -0,0 +1,84 @@
+# benchmarks/bench_document_ingest.py
+#
+# Resume ingestion on the bundled CV: the original fitz join (what the UI did
+# on every rerun), a cold parse_document and a cached one. --pages builds a
+# longer PDF by repeating the CV's pages to exercise parallel page decoding.
+#
+#   python benchmarks/bench_document_ingest.py [--repeat 20] [--pages 64]
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import config
+from app.document_reader import clear_cache, parse_document
+
+RESUME_PDF = os.path.join(ROOT, "resume_samples", "Swastik_cv_datascience.pdf")
+
+
+def legacy_read(data):
+    """Original ui.py path"""
+    import fitz
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return "\n".join([page.get_text() for page in doc])
+
+
+def repeated_pdf(data, pages):
+    import fitz
+    with fitz.open(stream=data, filetype="pdf") as src, fitz.open() as out:
+        while len(out) < pages:
+            out.insert_pdf(src, to_page=min(len(src), pages - len(out)) - 1)
+        return out.tobytes()
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF resume ingestion")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=0, help="also time a synthetic PDF with this many pages")
+    args = parser.parse_args()
+
+    with open(RESUME_PDF, "rb") as f:
+        data = f.read()
+
+    def cold():
+        clear_cache()
+        parse_document(data, "cv.pdf")
+
+    doc = parse_document(data, "cv.pdf")
+    print(f"{os.path.basename(RESUME_PDF)}: {doc['pages']} page(s), {len(doc['lines'])} lines, "
+          f"{len(doc['sentences'])} sentences, sections: {', '.join(doc['sections'])}")
+    print(f"  legacy fitz join      {timed(lambda: legacy_read(data), args.repeat) * 1000:8.2f} ms")
+    print(f"  parse_document cold   {timed(cold, args.repeat) * 1000:8.2f} ms")
+    print(f"  parse_document cached {timed(lambda: parse_document(data, 'cv.pdf'), args.repeat) * 1000:8.2f} ms")
+
+    if args.pages:
+        big = repeated_pdf(data, args.pages)
+        repeat = max(1, args.repeat // 10)
+        print(f"synthetic {args.pages}-page PDF:")
+        print(f"  legacy fitz join      {timed(lambda: legacy_read(big), repeat) * 1000:8.2f} ms")
+        for workers, label in ((1, "sequential"), (config.DOCUMENT_WORKERS, f"{config.DOCUMENT_WORKERS} workers")):
+            config.DOCUMENT_WORKERS = workers
+            config.DOCUMENT_PARALLEL_MIN_PAGES = 1 if workers > 1 else args.pages + 1
+
+            def cold_big():
+                clear_cache()
+                parse_document(big, "big.pdf")
+
+            print(f"  parse_document {label:<12} {timed(cold_big, repeat) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
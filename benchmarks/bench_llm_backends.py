@@ -0,0 +1,44 @@
+# benchmarks/bench_llm_backends.py
+#
+# Latency and throughput of the ideal-answer backends on the bundled JD.
+# Calls the backends directly (no result cache), so every run is a real generation.
+#
+#   python benchmarks/bench_llm_backends.py [--backends fake transformers] [--runs 3]
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.contextual_eval import LLAMA_PARAMS, _ideal_answer_prompt
+from app.llm_backends import BACKENDS, get_backend
+
+JD_TXT = os.path.join(ROOT, "sample_jd.txt")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ideal-answer LLM backends")
+    parser.add_argument("--backends", nargs="+", default=["fake"], choices=sorted(BACKENDS))
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(JD_TXT, "r", encoding="utf-8") as f:
+        prompt = _ideal_answer_prompt(f.read())
+
+    for name in args.backends:
+        backend = get_backend(name)
+        try:
+            for _ in range(args.runs):
+                "".join(backend(prompt, LLAMA_PARAMS))
+        except Exception as e:
+            print(f"{name:>12}: ❌ {e}")
+            continue
+        s = backend.stats.summary()
+        print(f"{name:>12}: {s['avg_latency_s']:.3f}s avg, {s['avg_first_token_s']:.3f}s first token, "
+              f"{s['tokens_per_s']} tokens/s ({s['tokens']} tokens over {s['calls']} runs)")
+
+
+if __name__ == "__main__":
+    main()
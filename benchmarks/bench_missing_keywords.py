@@ -0,0 +1,81 @@
+# benchmarks/bench_missing_keywords.py
+#
+# Compare the batched extract_missing_keywords against the original
+# per-word implementation on the bundled resume and JD.
+#
+#   python benchmarks/bench_missing_keywords.py [--repeat 5]
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sentence_transformers import util
+
+from app.embeddings import get_model
+from app.resume_matcher import preprocess_text, extract_missing_keywords
+
+RESUME_PDF = os.path.join(ROOT, "resume_samples", "Swastik_cv_datascience.pdf")
+JD_TXT = os.path.join(ROOT, "sample_jd.txt")
+
+
+def legacy_extract_missing_keywords(resume_text, jd_text, top_k=10):
+    """Original implementation: re-encodes the resume for every missing JD word"""
+    model = get_model()
+    resume_words = set(preprocess_text(resume_text).split())
+    jd_words = list(set(preprocess_text(jd_text).split()))
+
+    missing_scores = []
+    for word in jd_words:
+        if word not in resume_words:
+            word_embedding = model.encode(word, convert_to_tensor=True)
+            resume_embedding = model.encode(resume_text, convert_to_tensor=True)
+            score = util.pytorch_cos_sim(word_embedding, resume_embedding)[0][0].item()
+            missing_scores.append((word, score))
+
+    missing_scores.sort(key=lambda x: x[1], reverse=True)
+    return [word for word, _ in missing_scores[:top_k]]
+
+
+def load_inputs():
+    import fitz
+
+    with fitz.open(RESUME_PDF) as doc:
+        resume_text = "\n".join([page.get_text() for page in doc])
+    with open(JD_TXT, encoding="utf-8") as f:
+        jd_text = f.read()
+    return resume_text, jd_text
+
+
+def time_call(fn, repeat, *args):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), sum(timings) / len(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extract_missing_keywords")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    resume_text, jd_text = load_inputs()
+    get_model()  # exclude model load from both timings
+
+    legacy_best, legacy_mean, legacy = time_call(legacy_extract_missing_keywords, args.repeat, resume_text, jd_text)
+    new_best, new_mean, current = time_call(extract_missing_keywords, args.repeat, resume_text, jd_text)
+
+    print(f"legacy : best {legacy_best * 1000:8.1f} ms  mean {legacy_mean * 1000:8.1f} ms")
+    print(f"batched: best {new_best * 1000:8.1f} ms  mean {new_mean * 1000:8.1f} ms")
+    print(f"speedup: {legacy_best / max(new_best, 1e-9):.1f}x")
+    print(f"same keywords: {set(legacy) == set(current)}")
+
+
+if __name__ == "__main__":
+    main()
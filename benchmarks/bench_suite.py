@@ -0,0 +1,357 @@
+# benchmarks/bench_suite.py
+#
+# Offline benchmark of every analysis stage on the bundled samples plus
+# synthetic long JDs, resumes, transcripts and recordings. Each stage runs in
+# its own fresh process, so model loading is reported separately (first run)
+# and peak RSS belongs to that stage alone.
+#
+#   python benchmarks/bench_suite.py                          # all stages, sizes 1 2 4 8
+#   python benchmarks/bench_suite.py --stages analyze_transcript --sizes 1 4 16 --runs 20
+#   python benchmarks/bench_suite.py --save baseline.json
+#   python benchmarks/bench_suite.py --compare baseline.json  # exit 1 on a p50 regression
+
+import argparse
+import io
+import json
+import multiprocessing as mp
+import os
+import platform
+import resource
+import shutil
+import sys
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+JD_TXT = os.path.join(ROOT, "sample_jd.txt")
+RESUME_PDF = os.path.join(ROOT, "resume_samples", "Swastik_cv_datascience.pdf")
+SAMPLE_AUDIO = os.path.join(ROOT, "temp_input_audio")
+
+_FILLER_PHRASES = ["um", "uh", "you know", "like", "basically", "actually"]
+
+
+class SkipSize(Exception):
+    """Raised by a setup when one size can't run in this environment (reported, not an error)"""
+
+
+# -----------------------------
+# Inputs: bundled samples + synthetic generators
+# -----------------------------
+def _sample_texts():
+    from app.document_reader import parse_document
+
+    with open(JD_TXT, "r", encoding="utf-8") as f:
+        jd = f.read()
+    resume = parse_document(RESUME_PDF)["text"]
+    return jd, resume
+
+def synthetic_text(seed_text, n_sentences, rng, fillers=0.0):
+    """Sentences of 8-20 words drawn from the vocabulary of `seed_text`; `fillers` = filler rate per word"""
+    vocab = [w for w in seed_text.split() if w.isalpha()] or ["word"]
+    sentences = []
+    for _ in range(n_sentences):
+        words = []
+        for word in rng.choice(vocab, size=rng.integers(8, 21)):
+            if fillers and rng.random() < fillers:
+                words.append(rng.choice(_FILLER_PHRASES))
+            words.append(str(word))
+        sentences.append(" ".join(words).capitalize() + ".")
+    return " ".join(sentences)
+
+def synthetic_wav(seconds, rng, rate=16000):
+    """16-bit mono WAV of noise bursts ("speech") separated by silent pauses"""
+    samples = np.zeros(int(seconds * rate), dtype=np.float32)
+    position = 0
+    while position < len(samples):
+        burst = int(rng.uniform(0.8, 4.0) * rate)
+        samples[position:position + burst] = rng.normal(0, 0.2, size=len(samples[position:position + burst]))
+        position += burst + int(rng.uniform(0.2, 2.5) * rate)
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes((np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes())
+    return buf.getvalue()
+
+
+# -----------------------------
+# Stages: setup(size, rng) -> (call, work units); size 1 is the bundled sample
+# -----------------------------
+def _resume_jd(size, rng):
+    jd, resume = _sample_texts()
+    if size > 1:
+        jd = jd + " " + synthetic_text(jd, 5 * (size - 1), rng)
+        resume = resume + " " + synthetic_text(resume, 20 * (size - 1), rng)
+    return jd, resume
+
+def _transcript(size, rng):
+    jd, resume = _sample_texts()
+    return synthetic_text(jd + " " + resume, 10 * size, rng, fillers=0.05)
+
+def setup_resume_similarity(size, rng):
+    from app.resume_matcher import compute_similarity
+    jd, resume = _resume_jd(size, rng)
+    return lambda: compute_similarity(resume, jd), len(resume.split())
+
+def setup_missing_keywords(size, rng):
+    from app.resume_matcher import extract_missing_keywords
+    jd, resume = _resume_jd(size, rng)
+    return lambda: extract_missing_keywords(resume, jd, return_scores=True), len(jd.split())
+
+def setup_keyword_extract(size, rng):
+    from app.keyword_extractor import extract_keywords
+    jd, _ = _resume_jd(size, rng)
+    return lambda: extract_keywords(jd), len(jd.split())
+
+def setup_keyword_match(size, rng):
+    from app.keyword_extractor import keyword_match
+    jd, _ = _resume_jd(1, rng)
+    keywords = sorted({w.lower() for w in jd.split() if len(w) > 5})[:20]
+    transcript = _transcript(size, rng)
+    return lambda: keyword_match(keywords, transcript), len(transcript.split())
+
+def setup_contextual_similarity(size, rng):
+    from app.contextual_eval import compute_similarity
+    jd, resume = _sample_texts()
+    ideal = synthetic_text(jd, 8 * size, rng)
+    answer = _transcript(size, rng)
+    return lambda: compute_similarity(answer, ideal), len(answer.split())
+
+def setup_analyze_transcript(size, rng):
+    from app import grammar, nlp_pipeline
+    transcript = _transcript(size, rng)
+    words = len(transcript.split())
+
+    def call():
+        # Per-sentence sentiment/grammar caches would turn every repeat run into lookups
+        nlp_pipeline.clear_cache()
+        grammar.clear_cache()
+        return nlp_pipeline.analyze_transcript(transcript, duration_seconds=words / 2.2)
+    return call, words
+
+def setup_lexical_metrics(size, rng):
+    from app.text_metrics import lexical_metrics, tokenize_words
+    transcript = _transcript(size, rng)
+    return lambda: lexical_metrics(tokenize_words(transcript), 10 * size), len(transcript.split())
+
+def setup_document_parse(size, rng):
+    from app.document_reader import clear_cache, parse_document
+    with open(RESUME_PDF, "rb") as f:
+        data = f.read()
+    if size > 1:
+        import fitz
+        with fitz.open(stream=data, filetype="pdf") as src, fitz.open() as out:
+            for _ in range(size):
+                out.insert_pdf(src)
+            data = out.tobytes()
+
+    def call():
+        clear_cache()  # measure a real parse, not the content-hash cache
+        return parse_document(data, "resume.pdf")
+    return call, size
+
+def setup_audio_decode(size, rng):
+    from app.audio_decode import decode_audio
+    data = synthetic_wav(30 * size, rng)
+    return lambda: decode_audio(data), 30 * size
+
+def setup_acoustics(size, rng):
+    from app.acoustics import acoustic_metrics
+    from app.audio_decode import decode_audio
+    samples = decode_audio(synthetic_wav(30 * size, rng))["samples"]
+    return lambda: acoustic_metrics(samples), 30 * size
+
+def setup_transcribe_audio(size, rng):
+    from app.audio_decode import probe_duration
+    from app.audio_input import transcribe_audio
+    if size == 1:
+        with open(SAMPLE_AUDIO, "rb") as f:
+            data = f.read()
+        if data[:4] != b"RIFF" and shutil.which("ffmpeg") is None:
+            raise SkipSize("bundled MP4 sample needs ffmpeg")
+    else:
+        data = synthetic_wav(30 * size, rng)
+    seconds = probe_duration(data)
+
+    def call():
+        result = transcribe_audio(data)
+        if result["error"]:
+            raise RuntimeError(result["error"])
+        return result
+    return call, seconds
+
+_EMBEDDING = ["sentence_transformers"]
+
+# name -> (setup, unit of the work count used for throughput, required modules,
+#          optional modules the stage silently runs without)
+STAGES = {
+    "resume_similarity": (setup_resume_similarity, "words", _EMBEDDING, []),
+    "missing_keywords": (setup_missing_keywords, "words", _EMBEDDING, []),
+    "keyword_extract": (setup_keyword_extract, "words", _EMBEDDING + ["keybert"], []),
+    "keyword_match": (setup_keyword_match, "words", _EMBEDDING, []),
+    "contextual_similarity": (setup_contextual_similarity, "words", _EMBEDDING, []),
+    "analyze_transcript": (setup_analyze_transcript, "words", [], ["transformers", "language_tool_python"]),
+    "lexical_metrics": (setup_lexical_metrics, "words", [], []),
+    "document_parse": (setup_document_parse, "pages", ["fitz"], []),
+    "audio_decode": (setup_audio_decode, "audio s", [], []),
+    "acoustics": (setup_acoustics, "audio s", [], []),
+    "transcribe_audio": (setup_transcribe_audio, "audio s", ["whisper"], []),
+}
+
+def _missing(modules):
+    import importlib.util
+    return [m for m in modules if importlib.util.find_spec(m) is None]
+
+
+# -----------------------------
+# Measurement (runs in a fresh worker process per stage)
+# -----------------------------
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB on Linux
+
+def run_stage(name, sizes, runs, seed):
+    """Time one stage at every size; returns {"sizes": {size: stats}, ...} or {"skipped": reason}"""
+    # Benchmark the real computation, not the embedding cache
+    from app import config
+    config.EMBEDDING_CACHE = False
+
+    setup, unit, requires, optional = STAGES[name]
+    missing = _missing(requires)
+    if missing:
+        # Several stages swallow their errors, so timing them without the model would measure nothing
+        return {"unit": unit, "skipped": f"missing dependency: {', '.join(missing)}"}
+
+    result = {"unit": unit, "sizes": {}, "errors": {}, "skipped_sizes": {}, "degraded": _missing(optional)}
+    for size in sizes:
+        try:
+            rng = np.random.default_rng(seed + size)
+            call, work = setup(size, rng)
+
+            start = time.perf_counter()
+            call()  # first run includes model loading
+            first = time.perf_counter() - start
+
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                call()
+                timings.append(time.perf_counter() - start)
+        except SkipSize as e:
+            result["skipped_sizes"][str(size)] = str(e)
+            continue
+        except Exception as e:
+            result["errors"][str(size)] = f"{type(e).__name__}: {e}"
+            continue
+        timings = np.array(timings)
+        result["sizes"][str(size)] = {
+            "work": work,
+            "first_run_s": round(first, 4),
+            "p50_s": round(float(np.percentile(timings, 50)), 5),
+            "p90_s": round(float(np.percentile(timings, 90)), 5),
+            "p99_s": round(float(np.percentile(timings, 99)), 5),
+            "mean_s": round(float(timings.mean()), 5),
+            "throughput": round(work / float(timings.mean()), 1) if work and timings.mean() > 0 else None,
+        }
+    result["peak_rss_mb"] = round(_peak_rss_mb(), 1)
+    return result
+
+
+# -----------------------------
+# Reporting + baselines
+# -----------------------------
+def print_report(report):
+    print(f"{'stage':<22} {'size':>5} {'first':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'throughput':>18} {'rss MB':>8}")
+    for name, stage in report["stages"].items():
+        if "skipped" in stage:
+            print(f"{name:<22} ⚠️ {stage['skipped']}")
+            continue
+        for size, s in stage["sizes"].items():
+            tput = f"{s['throughput']} {stage['unit']}/s" if s["throughput"] is not None else "-"
+            print(f"{name:<22} {size:>5} {s['first_run_s'] * 1000:>7.1f}ms {s['p50_s'] * 1000:>7.2f}ms "
+                  f"{s['p90_s'] * 1000:>7.2f}ms {s['p99_s'] * 1000:>7.2f}ms {tput:>18} {stage['peak_rss_mb']:>8}")
+        for size, reason in stage.get("skipped_sizes", {}).items():
+            print(f"{name:<22} {size:>5} ⚠️ skipped: {reason}")
+        for size, error in stage["errors"].items():
+            print(f"{name:<22} {size:>5} ❌ {error}")
+        if stage["degraded"]:
+            print(f"{name:<22} ⚠️ ran without {', '.join(stage['degraded'])}")
+
+def scaling(stage):
+    """p50 growth relative to the smallest size: {size: ratio}"""
+    sizes = sorted(stage.get("sizes", {}), key=int)
+    if not sizes:
+        return {}
+    base = stage["sizes"][sizes[0]]["p50_s"] or 1e-9
+    return {size: round(stage["sizes"][size]["p50_s"] / base, 2) for size in sizes}
+
+def compare(report, baseline, tolerance):
+    """Print p50 ratios against the baseline; returns the list of regressions"""
+    regressions = []
+    print(f"\nComparison with baseline from {baseline.get('created', '?')} (tolerance {tolerance:.0%}):")
+    for name, stage in report["stages"].items():
+        old_stage = baseline.get("stages", {}).get(name, {})
+        for size, s in stage.get("sizes", {}).items():
+            old = old_stage.get("sizes", {}).get(size)
+            if not old or not old["p50_s"]:
+                continue
+            ratio = s["p50_s"] / old["p50_s"]
+            flag = "❌ slower" if ratio > 1 + tolerance else ("✅ faster" if ratio < 1 - tolerance else "")
+            print(f"  {name:<22} size {size:>3}: {old['p50_s'] * 1000:8.2f}ms -> {s['p50_s'] * 1000:8.2f}ms "
+                  f"({ratio:5.2f}x) {flag}")
+            if ratio > 1 + tolerance:
+                regressions.append((name, size, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every SpeakWise analysis stage")
+    parser.add_argument("--stages", nargs="+", default=list(STAGES), choices=list(STAGES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1, 2, 4, 8],
+                        help="input scale factors (1 = bundled sample size)")
+    parser.add_argument("--runs", type=int, default=10, help="timed runs per stage and size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed p50 slowdown before failing")
+    args = parser.parse_args()
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "runs": args.runs,
+        "stages": {},
+    }
+    for name in args.stages:
+        print(f"⏱️  {name}...", file=sys.stderr)
+        with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as pool:
+            stage = pool.submit(run_stage, name, args.sizes, args.runs, args.seed).result()
+        stage["scaling"] = scaling(stage)
+        report["stages"][name] = stage
+
+    print_report(report)
+    print("\nScaling (p50 relative to the smallest size):")
+    for name, stage in report["stages"].items():
+        if stage["scaling"]:
+            print(f"  {name:<22} " + "  ".join(f"x{size}: {ratio}" for size, ratio in stage["scaling"].items()))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Baseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,34 @@
-from app.ui import launch_app
+import argparse
 import os
 os.environ["STREAMLIT_WATCH_SUPPORT"] = "false"
 import streamlit as st
 from app.ui import launch_app
 
 
+def parse_args(argv=None):
+    # Under `streamlit run main.py -- --warmup` the flags arrive after `--`.
+    # Streamlit runs this script per session, so --warmup starts when the first
+    # browser session connects, in a background thread nobody waits for.
+    parser = argparse.ArgumentParser(description="SpeakWise - Career Success Toolkit")
+    parser.add_argument("--warmup", action="store_true",
+                        help="start loading and priming models in the background when the first session connects")
+    parser.add_argument("--warmup-only", action="store_true",
+                        help="warm up in this process, print per-component load times and exit "
+                             "(measures load times; does not warm a running server)")
+    parser.add_argument("--components", default=None,
+                        help="comma-separated warmup components (default from config)")
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
 if __name__ == "__main__":
-    launch_app()
\ No newline at end of file
+    args = parse_args()
+    components = args.components.split(",") if args.components else None
+    if args.warmup_only:
+        from app.warmup import warmup, print_report
+        print_report(warmup(components))
+    else:
+        if args.warmup:
+            from app.warmup import warmup_in_background
+            warmup_in_background(components)
+        launch_app()
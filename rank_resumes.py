@@ -0,0 +1,53 @@
+# rank_resumes.py
+#
+# Rank a folder of resumes (PDF/TXT) against one JD.
+#
+#   python rank_resumes.py resumes/ --jd sample_jd.txt --top 20
+#
+# Resumes are embedded into a persistent chunk index (config.RESUME_INDEX_DIR);
+# rerunning only embeds files that are new or changed since the last run and
+# drops files that were deleted.
+
+import argparse
+import json
+import sys
+
+from app.resume_index import ResumeIndex
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rank resumes against a job description")
+    parser.add_argument("resume_dir", nargs="?", help="folder of .pdf/.txt resumes to (re)index first")
+    parser.add_argument("--jd", required=True, help="job description text file")
+    parser.add_argument("--top", type=int, default=10, help="number of resumes to show")
+    parser.add_argument("--gaps", type=int, default=10, help="missing JD keywords per resume (0 to skip)")
+    parser.add_argument("--index-dir", default=None, help="index location (default: config.RESUME_INDEX_DIR)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    index = ResumeIndex(args.index_dir)
+
+    if args.resume_dir:
+        added, unchanged, removed, errors = index.add_folder(args.resume_dir)
+        print(f"📚 {len(index)} resumes indexed ({added} new/changed, {unchanged} unchanged, "
+              f"{removed} removed, {errors} failed)", file=sys.stderr)
+
+    with open(args.jd, "r", encoding="utf-8") as f:
+        jd_text = f.read()
+    ranked = index.rank(jd_text, top_n=args.top, gaps_top_k=args.gaps)
+
+    if args.json:
+        print(json.dumps(ranked, ensure_ascii=False, indent=2))
+        return 0
+    for position, result in enumerate(ranked, 1):
+        print(f"{position:>3}. {result['score']:6.2f}%  {result['name']}")
+        if result["missing_keywords"]:
+            print("       missing: " + ", ".join(word for word, _ in result["missing_keywords"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+# tests/test_import_budget.py
+#
+# Importing the Streamlit entry point must stay cheap: app.ui is imported in
+# a fresh interpreter and may neither exceed the budget nor pull in any heavy
+# model/runtime package (models load lazily on first use).
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_BUDGET_S = 2.0
+RUNS = 3
+
+# None of these may be imported just by loading the UI module
+HEAVY_MODULES = [
+    "torch",
+    "sentence_transformers",
+    "transformers",
+    "keybert",
+    "language_tool_python",
+    "whisper",
+    "replicate",
+    "sounddevice",
+    "fitz",
+]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.ui
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def _measure_import():
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def test_import_within_budget_and_lazy():
+    results = [_measure_import() for _ in range(RUNS)]
+    best = min(r["seconds"] for r in results)
+    loaded = sorted({m for r in results for m in r["loaded"]})
+
+    assert not loaded, f"heavy modules imported eagerly: {', '.join(loaded)}"
+    assert best <= IMPORT_BUDGET_S, f"import app.ui took {best:.3f}s (budget {IMPORT_BUDGET_S:.3f}s)"
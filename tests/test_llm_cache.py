@@ -0,0 +1,133 @@
+# tests/test_llm_cache.py
+#
+# Model-free tests of the ideal-answer cache (app/llm_cache.py) on the
+# deterministic FakeBackend: TTL expiry, cache keys, fan-out of concurrent
+# identical requests to one backend call, and failure handling.
+
+import threading
+import time
+
+import pytest
+
+from app import contextual_eval
+from app.llm_backends import FakeBackend
+from app.llm_cache import CoalescingGenerator, ResultCache, cache_key
+
+PROMPT = "Job Description: data analyst"
+PARAMS = {"temperature": 0.6, "max_new_tokens": 300}
+
+
+class _GatedBackend(FakeBackend):
+    """FakeBackend that waits on `release` before producing, and can fail mid-stream"""
+
+    def __init__(self, fail_after=None):
+        super().__init__(delay_s=0.005)
+        self.fail_after = fail_after
+        self.release = threading.Event()
+
+    def _generate(self, prompt, params):
+        self.release.wait(5)
+        for i, token in enumerate(super()._generate(prompt, params)):
+            if self.fail_after is not None and i == self.fail_after:
+                raise RuntimeError("backend failed")
+            yield token
+
+
+def _expected_text(prompt=PROMPT, params=PARAMS):
+    return "".join(FakeBackend()._generate(prompt, params))
+
+
+def _fan_out(generator, key, backend, callers):
+    """Start `callers` concurrent streams, release the backend, collect (text, error) per caller"""
+    results = [None] * callers
+    started = threading.Barrier(callers + 1)
+
+    def consume(i):
+        started.wait()
+        text = []
+        try:
+            for token in generator.stream(key, lambda: backend(PROMPT, PARAMS)):
+                text.append(token)
+            results[i] = ("".join(text), None)
+        except Exception as e:
+            results[i] = ("".join(text), str(e))
+
+    threads = [threading.Thread(target=consume, args=(i,)) for i in range(callers)]
+    for t in threads:
+        t.start()
+    started.wait()
+    time.sleep(0.1)  # every caller is now following the in-flight generation
+    backend.release.set()
+    for t in threads:
+        t.join(10)
+    return results
+
+
+def test_result_cache_ttl_expiry():
+    cache = ResultCache(":memory:", ttl_s=0.2)
+    cache.set("k", "value")
+    assert cache.get("k") == "value"
+    time.sleep(0.3)
+    assert cache.get("k") is None
+    cache.set("k", "again")
+    assert cache.get("k") == "again"
+
+
+def test_cache_key_depends_on_params_not_their_order():
+    reordered = dict(reversed(list(PARAMS.items())))
+    assert cache_key("p", "m", PARAMS) == cache_key("p", "m", reordered)
+    assert cache_key("p", "m", PARAMS) != cache_key("p", "m", dict(PARAMS, max_new_tokens=100))
+    assert cache_key("p", "m", PARAMS) != cache_key("p", "other", PARAMS)
+
+
+def test_concurrent_callers_share_one_backend_call():
+    generator = CoalescingGenerator(ResultCache(":memory:"))
+    backend = _GatedBackend()
+    results = _fan_out(generator, "jd-1", backend, callers=8)
+    assert backend.stats.calls == 1
+    assert results == [(_expected_text(), None)] * 8
+
+    # Completed results are served from the cache without a new backend call
+    cached = "".join(generator.stream("jd-1", lambda: backend(PROMPT, PARAMS)))
+    assert cached == _expected_text()
+    assert backend.stats.calls == 1
+
+
+def test_failure_reaches_every_caller_and_is_not_cached():
+    generator = CoalescingGenerator(ResultCache(":memory:"))
+    backend = _GatedBackend(fail_after=3)
+    results = _fan_out(generator, "jd-2", backend, callers=4)
+    assert backend.stats.calls == 1
+    partial = "".join(FakeBackend()._generate(PROMPT, dict(PARAMS, max_new_tokens=3)))
+    assert results == [(partial, "backend failed")] * 4
+
+    # The failure was not cached: the next request calls the backend again
+    retry = FakeBackend()
+    assert "".join(generator.stream("jd-2", lambda: retry(PROMPT, PARAMS))) == _expected_text()
+    assert retry.stats.calls == 1
+
+
+def test_stream_ideal_answer_caches_per_backend(monkeypatch):
+    monkeypatch.setattr(contextual_eval, "_generator", CoalescingGenerator(ResultCache(":memory:")))
+    backend = FakeBackend()
+    first = contextual_eval.generate_ideal_answers("Data analyst, SQL", backend=backend)
+    second = contextual_eval.generate_ideal_answers("Data analyst, SQL", backend=backend)
+    assert first == second and first
+    assert backend.stats.calls == 1
+
+
+def test_stream_ideal_answer_errors(monkeypatch):
+    monkeypatch.setattr(contextual_eval, "_generator", CoalescingGenerator(ResultCache(":memory:")))
+    backend = _GatedBackend(fail_after=2)
+    backend.release.set()
+
+    # Default: the error ends the stream as a token
+    tokens = list(contextual_eval.stream_ideal_answer("Data analyst", backend=backend))
+    assert tokens[-1] == "[LLM Error] backend failed"
+
+    # raise_errors: the tokens already streamed arrive, then the error propagates
+    streamed = []
+    with pytest.raises(RuntimeError, match="backend failed"):
+        for token in contextual_eval.stream_ideal_answer("Data analyst", backend=backend, raise_errors=True):
+            streamed.append(token)
+    assert len(streamed) == 2
@@ -0,0 +1,51 @@
+# tests/test_streaming_recorder.py
+#
+# Sound-card-free tests of the streaming recorder: a known signal is played
+# through ArrayInputStream into StreamingRecorder, and the ring buffer and the
+# live chunk queue must hand back exactly the samples that went in.
+
+import numpy as np
+
+from app.record_audio import ArrayInputStream, RingBuffer, StreamingRecorder
+
+SAMPLE_RATE = 16000
+
+
+def _record(samples, max_seconds):
+    recorder = StreamingRecorder(
+        sample_rate=SAMPLE_RATE, max_seconds=max_seconds, block_ms=100,
+        stream_factory=ArrayInputStream.factory(samples),
+    )
+    recorder.start()
+    recorder._stream.wait()
+    live = recorder.read_chunks()
+    return recorder.stop(), live, recorder.elapsed
+
+
+def test_ring_buffer_wraps_around():
+    ring = RingBuffer(10)
+    ring.write(np.arange(4, dtype=np.float32))
+    assert np.array_equal(ring.read_all(), np.arange(4))
+    ring.write(np.arange(4, 12, dtype=np.float32))
+    assert np.array_equal(ring.read_all(), np.arange(2, 12))
+    # A write larger than the buffer keeps only its newest samples
+    ring.write(np.arange(100, 125, dtype=np.float32))
+    assert np.array_equal(ring.read_all(), np.arange(115, 125))
+
+
+def test_recorder_round_trip():
+    # 2.55 s: the last block is a partial one
+    samples = np.sin(np.arange(int(2.55 * SAMPLE_RATE)) / 10.0).astype(np.float32)
+    recorded, live, elapsed = _record(samples, max_seconds=5)
+    assert np.array_equal(recorded, samples)
+    assert np.array_equal(live, samples)
+    assert abs(elapsed - len(samples) / SAMPLE_RATE) < 1e-9
+
+
+def test_recorder_stops_at_max_seconds():
+    # Longer than max_seconds: recording stops at the cap and keeps the first max_seconds
+    samples = np.arange(3 * SAMPLE_RATE, dtype=np.float32)
+    recorded, _, elapsed = _record(samples, max_seconds=2)
+    assert len(recorded) == 2 * SAMPLE_RATE
+    assert np.array_equal(recorded, samples[:2 * SAMPLE_RATE])
+    assert elapsed == 2.0